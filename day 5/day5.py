@@ -52,11 +52,179 @@ def get_weather(city):
 
 print("London weather:", get_weather("London"))
 
+# ⚡ Caching + request coalescing for hot lookups
+import asyncio
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+
+_MISSING = object()
+
+class TTLCache:
+    """Bounded LRU cache whose entries expire `ttl` seconds after being stored."""
+
+    def __init__(self, maxsize=1024, ttl=60.0):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data = OrderedDict()  # key -> (expires_at, value)
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return default
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                del self._data[key]
+                return default
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key, value):
+        with self._lock:
+            self._data[key] = (time.monotonic() + self.ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)  # Evict least recently used
+
+    def __len__(self):
+        return len(self._data)
+
+class SingleFlight:
+    """Threaded callers asking for the same key share one in-flight call."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls = {}  # key -> Future of the running call
+
+    def do(self, key, fn, *args):
+        with self._lock:
+            future = self._calls.get(key)
+            leader = future is None
+            if leader:
+                future = self._calls[key] = Future()
+        if not leader:
+            return future.result()  # Wait for the leader's result (or error)
+        try:
+            future.set_result(fn(*args))
+        except BaseException as exc:
+            future.set_exception(exc)
+        finally:
+            with self._lock:
+                del self._calls[key]
+        return future.result()
+
+class AsyncSingleFlight:
+    """asyncio version: tasks asking for the same key await one shared task."""
+
+    def __init__(self):
+        self._calls = {}  # key -> asyncio.Task of the running call
+
+    async def do(self, key, coro_fn, *args):
+        task = self._calls.get(key)
+        if task is None:
+            task = asyncio.ensure_future(coro_fn(*args))
+            self._calls[key] = task
+            task.add_done_callback(lambda _: self._calls.pop(key, None))
+        # shield() so one cancelled caller doesn't cancel the call everyone shares
+        return await asyncio.shield(task)
+
+class WeatherLookup:
+    """TTL cache in front of `fetch`, with single-flight on cache misses."""
+
+    def __init__(self, fetch=get_weather, afetch=None, maxsize=1024, ttl=60.0):
+        self.fetch = fetch
+        self.afetch = afetch  # Optional coroutine version of fetch
+        self.cache = TTLCache(maxsize, ttl)
+        self._flight = SingleFlight()
+        self._async_flight = AsyncSingleFlight()
+
+    def get(self, city):
+        value = self.cache.get(city, _MISSING)
+        if value is _MISSING:
+            value = self._flight.do(city, self._fetch_and_store, city)
+        return value
+
+    async def aget(self, city):
+        value = self.cache.get(city, _MISSING)
+        if value is _MISSING:
+            value = await self._async_flight.do(city, self._afetch_and_store, city)
+        return value
+
+    def _fetch_and_store(self, city):
+        # Re-check: a previous leader may have filled the cache since our miss
+        value = self.cache.get(city, _MISSING)
+        if value is _MISSING:
+            value = self.fetch(city)
+            self.cache.set(city, value)
+        return value
+
+    async def _afetch_and_store(self, city):
+        value = self.cache.get(city, _MISSING)
+        if value is _MISSING:
+            if self.afetch is not None:
+                value = await self.afetch(city)
+            else:  # Keep the event loop free while the blocking fetch runs
+                value = await asyncio.get_running_loop().run_in_executor(None, self.fetch, city)
+            self.cache.set(city, value)
+        return value
+
+weather = WeatherLookup(ttl=30)
+print("Cached London weather:", weather.get("London"))
+
+# 🧪 Load test: many concurrent handlers asking for the same few cities
+def weather_load_test(callers=200, cities=("London", "Paris"), latency=0.05, workers=50):
+    calls = {"naive": 0, "threads": 0, "asyncio": 0}
+    calls_lock = threading.Lock()
+
+    def upstream(mode):
+        def fetch(city):
+            with calls_lock:
+                calls[mode] += 1
+            time.sleep(latency)  # Simulated network round trip
+            return get_weather(city)
+        return fetch
+
+    async def async_upstream(city):
+        calls["asyncio"] += 1
+        await asyncio.sleep(latency)
+        return get_weather(city)
+
+    requested = [cities[i % len(cities)] for i in range(callers)]
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        started = time.perf_counter()
+        list(pool.map(upstream("naive"), requested))
+        naive_time = time.perf_counter() - started
+
+        lookup = WeatherLookup(fetch=upstream("threads"))
+        started = time.perf_counter()
+        list(pool.map(lookup.get, requested))
+        threads_time = time.perf_counter() - started
+
+    async def run_async():
+        lookup = WeatherLookup(afetch=async_upstream)
+        await asyncio.gather(*(lookup.aget(city) for city in requested))
+
+    started = time.perf_counter()
+    asyncio.run(run_async())
+    async_time = time.perf_counter() - started
+
+    print(f"\n{callers} concurrent lookups over {len(cities)} cities:")
+    print(f"• No cache:          {calls['naive']:>4} upstream calls in {naive_time:.2f}s")
+    print(f"• Threads + cache:   {calls['threads']:>4} upstream calls in {threads_time:.2f}s")
+    print(f"• asyncio + cache:   {calls['asyncio']:>4} upstream calls in {async_time:.2f}s")
+    return calls
+
+weather_load_test()
+
 """
 📚 Learning Checklist:
 ✅ API keys and authentication
 ✅ Environment variables for secrets
 ✅ Mocking APIs for testing
+✅ TTL caching and request coalescing (single-flight)
 """
 
 # ==================== 🕷️ LEVEL 4: WEB SCRAPING BASICS ====================
@@ -115,29 +283,538 @@ print("2. Download ChromeDriver")
 # ==================== 🚀 LEVEL 6: PRODUCTION-READY APIS ====================
 print("\n" + "="*60 + "\n🚀 LEVEL 6: Professional API Client\n" + "="*60)
 
+import codecs
+import email.utils
+import json
+import re
+from itertools import chain
+from urllib.parse import urlsplit
+
+class TokenBucket:
+    """Token bucket for a `rate` requests/sec limit, holding at most `burst` tokens.
+
+    Callers reserve a token and sleep until it is due, so concurrent callers are
+    spaced evenly instead of stampeding into 429s and backing off. Tokens refill
+    at `headroom` × `rate`, so clock jitter and the first burst never push the
+    server's measured rate over its limit.
+    """
+
+    def __init__(self, rate, burst=1, headroom=0.95):
+        self.limit = rate
+        self.rate = rate * headroom
+        self.burst = burst
+        self._tokens = float(burst)  # Negative = tokens already promised to waiters
+        self._updated = time.monotonic()  # In the future while paused by Retry-After
+        self._pauses = 0  # Bumped by penalize() so sleeping callers know to re-queue
+        self._lock = threading.Lock()
+
+    def _reserve(self):
+        """Take one token, possibly on credit; return (seconds to wait, pause count)."""
+        with self._lock:
+            now = time.monotonic()
+            if now > self._updated:
+                self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+            self._tokens -= 1
+            ready_at = self._updated + max(0.0, -self._tokens) / self.rate
+            return max(0.0, ready_at - now), self._pauses
+
+    def acquire(self):
+        while True:
+            wait, pauses = self._reserve()
+            time.sleep(wait)
+            if pauses == self._pauses:
+                return
+            # A Retry-After arrived while we slept: our token is void, queue again
+
+    async def acquire_async(self):
+        while True:
+            wait, pauses = self._reserve()
+            await asyncio.sleep(wait)
+            if pauses == self._pauses:
+                return
+
+    def penalize(self, seconds):
+        """Stop handing out tokens for `seconds`, e.g. after a Retry-After header."""
+        with self._lock:
+            resume_at = time.monotonic() + seconds
+            if resume_at > self._updated:
+                # Waiters re-reserve, so drop their debt; no refill while paused, then
+                # restart at a steady pace rather than a burst
+                self._tokens = min(max(self._tokens, 0.0), 1.0)
+                self._updated = resume_at
+                self._pauses += 1
+
+_rate_limiters = {}  # host -> TokenBucket, shared by every client in the process
+_rate_limiters_lock = threading.Lock()
+
+def get_rate_limiter(host, rate, burst=1):
+    """Return the process-wide bucket for `host`, creating it on first use.
+
+    A host has one limit per process, so asking for it again with a different
+    `rate` or `burst` raises ValueError instead of quietly using the old one.
+    """
+    with _rate_limiters_lock:
+        bucket = _rate_limiters.get(host)
+        if bucket is None:
+            bucket = _rate_limiters[host] = TokenBucket(rate, burst)
+        elif (bucket.limit, bucket.burst) != (rate, burst):
+            raise ValueError(
+                f"{host} is already limited to {bucket.limit} req/s (burst {bucket.burst}); "
+                f"got {rate} req/s (burst {burst})"
+            )
+        return bucket
+
+def parse_retry_after(value):
+    """Retry-After is either delay-seconds or an HTTP date; return seconds to wait."""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        retry_at = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, retry_at.timestamp() - time.time())
+
+import socket
+from collections import deque
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+from urllib3.exceptions import ConnectTimeoutError, NameResolutionError, NewConnectionError
+from urllib3.util.connection import allowed_gai_family
+from urllib3.util.timeout import _DEFAULT_TIMEOUT
+
+def _latency_summary(samples):
+    if not samples:
+        return {"count": 0}
+    ordered = sorted(samples)
+    pick = lambda q: ordered[min(len(ordered) - 1, int(q * len(ordered)))] * 1000
+    return {
+        "count": len(ordered),
+        "avg_ms": round(sum(ordered) / len(ordered) * 1000, 3),
+        "p50_ms": round(pick(0.50), 3),
+        "p99_ms": round(pick(0.99), 3),
+        "max_ms": round(ordered[-1] * 1000, 3),
+    }
+
+class PoolMetrics:
+    """Connection reuse counters and latency samples for one host's pool."""
+
+    def __init__(self, pool, samples=1024):
+        self.pool = pool
+        self.opened = 0
+        self.reused = 0
+        self.wait = deque(maxlen=samples)  # Time spent checking a connection out
+        self.dns = deque(maxlen=samples)
+        self.connect = deque(maxlen=samples)  # TCP + TLS handshake, excluding DNS
+        self.ttfb = deque(maxlen=samples)  # Request sent -> response headers parsed
+        self._lock = threading.Lock()
+
+    def record_checkout(self, waited, reused):
+        with self._lock:
+            self.wait.append(waited)
+            if reused:
+                self.reused += 1
+
+    def record_connect(self, dns, connect):
+        with self._lock:
+            self.opened += 1
+            self.dns.append(dns)
+            self.connect.append(connect)
+
+    def record_ttfb(self, seconds):
+        with self._lock:
+            self.ttfb.append(seconds)
+
+    def snapshot(self):
+        with self._lock:
+            idle = sum(conn is not None for conn in list(self.pool.pool.queue))
+            return {
+                "pool_maxsize": self.pool.pool.maxsize,
+                "idle_connections": idle,
+                "connections_opened": self.opened,
+                "connections_reused": self.reused,
+                "pool_wait": _latency_summary(self.wait),
+                "dns": _latency_summary(self.dns),
+                "connect": _latency_summary(self.connect),
+                "ttfb": _latency_summary(self.ttfb),
+            }
+
+def _instrumented_connection(base):
+    class InstrumentedConnection(base):
+        pool_metrics = None  # Set by the owning pool
+
+        def connect(self):
+            started = time.perf_counter()
+            self._dns_seconds = 0.0
+            super().connect()
+            if self.pool_metrics:
+                elapsed = time.perf_counter() - started
+                self.pool_metrics.record_connect(self._dns_seconds, elapsed - self._dns_seconds)
+
+        def _new_conn(self):
+            # Resolve first so DNS is timed on its own, then try every address in
+            # order with the same family filter as urllib3's create_connection
+            started = time.perf_counter()
+            try:
+                addresses = socket.getaddrinfo(
+                    self._dns_host.strip("[]"), self.port, allowed_gai_family(), socket.SOCK_STREAM
+                )
+            except socket.gaierror as e:
+                raise NameResolutionError(self.host, self, e) from e
+            finally:
+                self._dns_seconds = time.perf_counter() - started
+
+            error = OSError("getaddrinfo returns an empty list")
+            for family, socktype, proto, _, sockaddr in addresses:
+                sock = None
+                try:
+                    sock = socket.socket(family, socktype, proto)
+                    for option in self.socket_options or ():
+                        sock.setsockopt(*option)
+                    if self.timeout is not _DEFAULT_TIMEOUT:
+                        sock.settimeout(self.timeout)
+                    if self.source_address:
+                        sock.bind(self.source_address)
+                    sock.connect(sockaddr)
+                    return sock
+                except OSError as e:
+                    error = e
+                    if sock is not None:
+                        sock.close()
+            if isinstance(error, socket.timeout):
+                raise ConnectTimeoutError(
+                    self, f"Connection to {self.host} timed out. (connect timeout={self.timeout})"
+                ) from error
+            raise NewConnectionError(self, f"Failed to establish a new connection: {error}") from error
+
+        def getresponse(self, *args, **kwargs):
+            started = time.perf_counter()
+            response = super().getresponse(*args, **kwargs)
+            if self.pool_metrics:
+                self.pool_metrics.record_ttfb(time.perf_counter() - started)
+            return response
+
+    return InstrumentedConnection
+
+def _instrumented_pool(base, connection_cls, adapter):
+    class InstrumentedPool(base):
+        ConnectionCls = connection_cls
+
+        def __init__(self, *args, **kwargs):
+            super().__init__(*args, **kwargs)
+            self.metrics = adapter._register_pool(self)
+
+        def _new_conn(self):
+            conn = super()._new_conn()
+            conn.pool_metrics = self.metrics
+            return conn
+
+        def _get_conn(self, timeout=None):
+            started = time.perf_counter()
+            conn = super()._get_conn(timeout)
+            # A live socket means the keep-alive connection is being reused
+            self.metrics.record_checkout(time.perf_counter() - started, conn.sock is not None)
+            return conn
+
+    return InstrumentedPool
+
+class InstrumentedHTTPAdapter(HTTPAdapter):
+    """HTTPAdapter whose per-host pools record connection reuse and latencies."""
+
+    def __init__(self, pool_connections=10, pool_maxsize=10, pool_block=False, **kwargs):
+        self._pool_metrics = {}  # "scheme://host:port" -> PoolMetrics
+        self._metrics_lock = threading.Lock()
+        super().__init__(pool_connections=pool_connections, pool_maxsize=pool_maxsize,
+                         pool_block=pool_block, **kwargs)
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            "http": _instrumented_pool(HTTPConnectionPool, _instrumented_connection(HTTPConnection), self),
+            "https": _instrumented_pool(HTTPSConnectionPool, _instrumented_connection(HTTPSConnection), self),
+        }
+
+    def _register_pool(self, pool):
+        metrics = PoolMetrics(pool)
+        with self._metrics_lock:
+            self._pool_metrics[f"{pool.scheme}://{pool.host}:{pool.port}"] = metrics
+        return metrics
+
+    def metrics_snapshot(self):
+        with self._metrics_lock:
+            pools = list(self._pool_metrics.items())
+        return {key: metrics.snapshot() for key, metrics in pools}
+
 class ProfessionalAPIClient:
-    def __init__(self):
+    def __init__(self, rate_limit=None, burst=1, pool_connections=10, pool_maxsize=10, pool_block=False):
+        """Rate limits are per host and shared by every client in the process.
+
+        Requests to a host raise ValueError if another client has already
+        limited it with a different `rate_limit` or `burst`.
+        """
         self.session = requests.Session()
         self.session.headers.update({
             "User-Agent": "MyApp/1.0",
             "Accept": "application/json"
         })
+        # pool_maxsize = keep-alive connections per host; pool_block waits for one instead of opening extras
+        self.adapter = InstrumentedHTTPAdapter(pool_connections, pool_maxsize, pool_block)
+        self.session.mount("http://", self.adapter)
+        self.session.mount("https://", self.adapter)
+        self.rate_limit = rate_limit  # Requests/sec per host, None = unlimited
+        self.burst = burst
     
+    def pool_metrics(self):
+        """Dict snapshot of per-pool connection and latency metrics."""
+        return self.adapter.metrics_snapshot()
+
+
+    def _limiter(self, url):
+        if self.rate_limit is None:
+            return None
+        return get_rate_limiter(urlsplit(url).netloc, self.rate_limit, self.burst)
+
     def get_with_retry(self, url, max_retries=3):
+        return self._with_retries(url, max_retries, lambda response: response.json())
+
+    def stream_json_array(self, url, max_retries=3, chunk_size=64 * 1024):
+        """Yield the elements of a top-level JSON array as the body arrives.
+
+        Retries cover everything up to the first body byte; once streaming has
+        started, a dropped connection is raised to the caller.
+        """
+        def first_chunk(response):
+            chunks = response.iter_content(chunk_size)
+            first = next(chunks, b"")  # Waits for the first byte inside the retry loop
+            return response, chain((first,), chunks)
+
+        response, chunks = self._with_retries(url, max_retries, first_chunk, stream=True)
+        with response:
+            yield from iter_json_array(chunks)
+
+    def _with_retries(self, url, max_retries, read, stream=False):
+        limiter = self._limiter(url)
         for attempt in range(max_retries):
+            if limiter:
+                limiter.acquire()  # Proactively stay under the host's limit
+            response = None
             try:
-                response = self.session.get(url, timeout=5)
+                response = self.session.get(url, timeout=5, stream=stream)
                 response.raise_for_status()
-                return response.json()
+                return read(response)
             except requests.exceptions.RequestException as e:
+                if stream and response is not None:
+                    response.close()
                 print(f"Attempt {attempt+1} failed: {str(e)}")
                 if attempt == max_retries - 1:
                     raise
-                time.sleep(2 ** attempt)  # Exponential backoff
+                retry_after = None
+                if e.response is not None:
+                    retry_after = parse_retry_after(e.response.headers.get("Retry-After"))
+                if retry_after is None:
+                    time.sleep(2 ** attempt)  # Exponential backoff
+                elif limiter:
+                    limiter.penalize(retry_after)  # Pauses every caller for this host
+                else:
+                    time.sleep(retry_after)
+
+_json_decoder = json.JSONDecoder()
+_JSON_WHITESPACE = re.compile(r"[ \t\n\r]*")
+
+def _expect_json_end(rest):
+    """Reject anything but whitespace after the closing ']'."""
+    for text in rest:
+        if text.strip(" \t\n\r"):
+            raise ValueError("Extra data after JSON array")
+
+def iter_json_array(chunks):
+    """Incrementally parse a top-level JSON array from byte chunks.
+
+    Only the unparsed tail of the body is kept, so memory is bounded by about
+    twice the largest element plus one chunk rather than by the whole payload.
+    An element split across chunks is re-parsed only once the text buffered
+    since the last attempt has doubled, which keeps large elements linear.
+    """
+    chunks = iter(chunks)
+    decode = codecs.getincrementaldecoder("utf-8")().decode
+    buf, pos, eof = "", 0, False
+    state = "open"  # open -> first -> (sep -> value)* -> done
+
+    def rest():
+        yield buf[pos:]
+        for chunk in chunks:
+            yield decode(chunk)
+        yield decode(b"", final=True)
+
+    while True:
+        pos = _JSON_WHITESPACE.match(buf, pos).end()
+        need_more = pos == len(buf)
+        if not need_more:
+            if state == "open":
+                if buf[pos] != "[":
+                    raise ValueError("Expected a JSON array")
+                pos += 1
+                state = "first"
+                continue
+            if state == "sep":
+                if buf[pos] == "]":
+                    pos += 1
+                    _expect_json_end(rest())
+                    return
+                if buf[pos] != ",":
+                    raise ValueError(f"Expected ',' or ']' in JSON array, got {buf[pos]!r}")
+                pos += 1
+                state = "value"
+                continue
+            if state == "first" and buf[pos] == "]":
+                pos += 1
+                _expect_json_end(rest())
+                return
+            try:
+                element, end = _json_decoder.raw_decode(buf, pos)
+            except json.JSONDecodeError:
+                if eof:
+                    raise
+                need_more = True  # Element continues in the next chunk
+            else:
+                # Only trust the element once its ',' or ']' has arrived: a number
+                # cut at the chunk edge ("12" or "-1.") may continue in the next one
+                after = _JSON_WHITESPACE.match(buf, end).end()
+                if not eof and (after == len(buf) or buf[after] not in ",]"):
+                    need_more = True
+                else:
+                    yield element
+                    pos = end
+                    state = "sep"
+                    continue
+
+        if eof:
+            raise ValueError("Truncated JSON array")
+        # Read at least one chunk, and at least as much text as is already waiting,
+        # collecting the pieces in a list so they are joined once per attempt
+        tail = buf[pos:]
+        parts, added = [tail], 0
+        while not eof and (added == 0 or added < len(tail)):
+            chunk = next(chunks, None)
+            if chunk is None:
+                eof = True
+                parts.append(decode(b"", final=True))
+            else:
+                text = decode(chunk)
+                parts.append(text)
+                added += len(text)
+        buf, pos = "".join(parts), 0
 
 # Usage example:
 client = ProfessionalAPIClient()
 # data = client.get_with_retry("https://api.example.com/data")
+# limited = ProfessionalAPIClient(rate_limit=10, burst=1)  # Shares one bucket per host
+
+# 🧪 Threads and asyncio tasks drawing from the same per-host bucket
+def rate_limiter_demo(rate=50, thread_calls=40, task_calls=40):
+    bucket = get_rate_limiter("demo.example.com", rate)
+    started = time.perf_counter()
+
+    def worker():
+        for _ in range(thread_calls // 4):
+            bucket.acquire()
+
+    async def tasks():
+        async def one():
+            await bucket.acquire_async()
+        await asyncio.gather(*(one() for _ in range(task_calls)))
+
+    threads = [threading.Thread(target=worker) for _ in range(4)]
+    for t in threads:
+        t.start()
+    asyncio.run(tasks())
+    for t in threads:
+        t.join()
+
+    elapsed = time.perf_counter() - started
+    total = thread_calls + task_calls
+    print(f"{total} calls in {elapsed:.2f}s → {total / elapsed:.1f} req/s "
+          f"(limit {rate}/s, paced at {bucket.rate:g}/s)")
+
+rate_limiter_demo()
+
+# 🧪 Streaming vs buffered decoding of a large JSON array
+import tracemalloc
+
+def streaming_json_demo(items=200_000, chunk_size=64 * 1024):
+    def body_chunks():  # Stands in for response.iter_content()
+        yield b"["
+        pending = []
+        for i in range(items):
+            pending.append(json.dumps({"id": i, "name": f"item {i}"}))
+            if len(pending) == 1000:
+                yield (",".join(pending) + ("," if i < items - 1 else "")).encode()
+                pending = []
+        yield (",".join(pending) + "]").encode()
+
+    def rechunk(chunks):
+        buffer = b""
+        for data in chunks:
+            buffer += data
+            while len(buffer) >= chunk_size:
+                yield buffer[:chunk_size]
+                buffer = buffer[chunk_size:]
+        yield buffer
+
+    for label, parse in (
+        ("response.json()", lambda: len(json.loads(b"".join(rechunk(body_chunks()))))),
+        ("stream_json_array", lambda: sum(1 for _ in iter_json_array(rechunk(body_chunks())))),
+    ):
+        tracemalloc.start()
+        count = parse()
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        print(f"{label:<18} {count:,} items, peak memory {peak / 1e6:.1f} MB")
+
+streaming_json_demo()
+# for item in client.stream_json_array("https://api.example.com/huge-array"): ...
+
+# 🧪 Watching connection reuse against a local keep-alive server
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+class _DemoHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # Keep-alive, so connections can be reused
+
+    def do_GET(self):
+        body = json.dumps([{"id": i} for i in range(100)]).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+def connection_pool_demo(requests_count=50, workers=8, pool_maxsize=4):
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _DemoHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_port}/items"
+    try:
+        api = ProfessionalAPIClient(pool_maxsize=pool_maxsize, pool_block=True)
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            list(pool.map(lambda _: api.get_with_retry(url), range(requests_count)))
+        print(f"Streamed {sum(1 for _ in api.stream_json_array(url))} items from {url}")
+        for key, stats in api.pool_metrics().items():
+            print(f"{key}: opened {stats['connections_opened']}, reused {stats['connections_reused']}, "
+                  f"max pool wait {stats['pool_wait'].get('max_ms', 0):.2f} ms, "
+                  f"p50 TTFB {stats['ttfb'].get('p50_ms', 0):.2f} ms")
+        return api.pool_metrics()
+    finally:
+        server.shutdown()
+        server.server_close()
+
+connection_pool_demo()
 
 """
 📚 Learning Checklist:
@@ -145,16 +822,185 @@ client = ProfessionalAPIClient()
 ✅ Exponential backoff
 ✅ Proper headers
 ✅ Timeout handling
+✅ Token-bucket rate limiting and Retry-After
+✅ Streaming JSON decoding
+✅ Connection pool sizing and metrics
 """
 
 # ==================== 💼 LEVEL 7: REAL-WORLD PROJECT ====================
 print("\n" + "="*60 + "\n💼 LEVEL 7: Job Market Analyzer\n" + "="*60)
 
+import csv
+import math
+import os
+import random
+import tempfile
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from itertools import islice
+
+class QuantileSketch:
+    """Mergeable log-bucket histogram (DDSketch-style) for salary percentiles.
+
+    Quantiles are within `relative_accuracy` of the true value, memory grows
+    with the number of buckets (not rows), and sketches merge by adding counts.
+    """
+
+    def __init__(self, relative_accuracy=0.01):
+        self.relative_accuracy = relative_accuracy
+        self._gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._log_gamma = math.log(self._gamma)
+        self.buckets = {}  # bucket index -> count
+        self.count = 0
+
+    def add(self, value):
+        if value <= 0:
+            return
+        index = math.ceil(math.log(value) / self._log_gamma)
+        self.buckets[index] = self.buckets.get(index, 0) + 1
+        self.count += 1
+
+    def merge(self, other):
+        for index, n in other.buckets.items():
+            self.buckets[index] = self.buckets.get(index, 0) + n
+        self.count += other.count
+        return self
+
+    def quantile(self, q):
+        if not self.count:
+            return None
+        rank = q * (self.count - 1)
+        seen = 0
+        for index in sorted(self.buckets):
+            seen += self.buckets[index]
+            if seen > rank:
+                return 2 * self._gamma ** index / (self._gamma + 1)
+
+def build_skill_matcher(skills):
+    """One precompiled, case-insensitive regex that finds every skill in a single pass."""
+    canonical = {skill.lower(): skill for skill in skills}
+    # Longest first so "JavaScript" wins over "Java"; custom boundaries keep "C++"/"C#" intact
+    alternation = "|".join(re.escape(s) for s in sorted(canonical, key=len, reverse=True))
+    pattern = re.compile(rf"(?<![\w+#])(?:{alternation})(?![\w+#])", re.IGNORECASE)
+    return pattern, canonical
+
+_SALARY_NUMBER = re.compile(r"(\d[\d,]*(?:\.\d+)?)\s*([kK])?")
+
+def parse_salary(value):
+    """Turn 110000, "$110,000" or "90k - 120k" (midpoint) into a float."""
+    if value is None or value == "":
+        return None
+    if isinstance(value, (int, float)):
+        return float(value)
+    amounts = [
+        float(number.replace(",", "")) * (1000 if thousands else 1)
+        for number, thousands in _SALARY_NUMBER.findall(str(value))
+    ]
+    return sum(amounts) / len(amounts) if amounts else None
+
+_matchers = {}  # Per-process cache: compile once per worker, not once per batch
+
+def _analyze_batch(job):
+    kind, batch, skills, text_fields, salary_field = job
+    if skills not in _matchers:
+        _matchers[skills] = build_skill_matcher(skills)
+    matcher, canonical = _matchers[skills]
+
+    counts = dict.fromkeys(skills, 0)
+    sketches = {skill: QuantileSketch() for skill in skills}
+    skipped = 0  # Malformed records; one bad line must not fail a huge dump
+    for item in batch:
+        if kind == "jsonl":
+            if not item.strip():
+                continue
+            try:
+                record = json.loads(item)
+            except ValueError:
+                skipped += 1
+                continue
+            if not isinstance(record, dict):
+                skipped += 1
+                continue
+            text = " ".join(str(record.get(field) or "") for field in text_fields)
+            salary = record.get(salary_field)
+        else:
+            text, salary = item
+        found = {canonical[match.lower()] for match in matcher.findall(text)}
+        if not found:
+            continue
+        salary = parse_salary(salary)
+        for skill in found:
+            counts[skill] += 1
+            if salary:
+                sketches[skill].add(salary)
+    return counts, sketches, skipped
+
+def iter_posting_batches(path, batch_size, text_fields, salary_field):
+    """Stream a CSV or JSONL dump as batches without loading the whole file."""
+    if path.endswith((".jsonl", ".ndjson")):
+        with open(path, encoding="utf-8") as f:
+            # Raw lines go to the workers so JSON decoding happens in parallel too
+            while batch := list(islice(f, batch_size)):
+                yield "jsonl", batch
+    else:
+        with open(path, newline="", encoding="utf-8") as f:
+            reader = csv.DictReader(f)
+            while rows := list(islice(reader, batch_size)):
+                yield "rows", [
+                    (" ".join(row.get(field) or "" for field in text_fields), row.get(salary_field))
+                    for row in rows
+                ]
+
 class JobMarketAnalyzer:
-    def __init__(self):
-        self.skills = ["Python", "JavaScript", "SQL"]
+    def __init__(self, skills=("Python", "JavaScript", "SQL")):
+        self.skills = list(skills)
     
-    def analyze(self):
+    def analyze(self, path=None, processes=None, batch_size=20_000,
+                text_fields=("title", "description"), salary_field="salary"):
+        if path is None:
+            return self._sample_insights()
+
+        skills = tuple(self.skills)
+        counts = dict.fromkeys(skills, 0)
+        sketches = {skill: QuantileSketch() for skill in skills}
+        skipped = 0
+        processes = processes or os.cpu_count() or 1
+        started = time.perf_counter()
+
+        def fold(future):
+            nonlocal skipped
+            batch_counts, batch_sketches, batch_skipped = future.result()
+            skipped += batch_skipped
+            for skill in skills:
+                counts[skill] += batch_counts[skill]
+                sketches[skill].merge(batch_sketches[skill])
+
+        with ProcessPoolExecutor(max_workers=processes) as pool:
+            pending = set()
+            for kind, batch in iter_posting_batches(path, batch_size, text_fields, salary_field):
+                # Keep only a few batches in flight so memory stays flat on huge files
+                if len(pending) >= processes * 2:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        fold(future)
+                pending.add(pool.submit(_analyze_batch, (kind, batch, skills, text_fields, salary_field)))
+            for future in pending:
+                fold(future)
+
+        print(f"\n💡 Job Market Insights ({os.path.basename(path)}, {time.perf_counter() - started:.1f}s):")
+        results = {}
+        for skill in sorted(skills, key=counts.get, reverse=True):
+            p50, p90 = sketches[skill].quantile(0.5), sketches[skill].quantile(0.9)
+            results[skill] = {"demand": counts[skill], "p50_salary": p50, "p90_salary": p90}
+            print(f"{skill}:")
+            print(f"  • Postings: {counts[skill]:,}")
+            print(f"  • Median Salary: {f'${p50:,.0f}' if p50 else 'N/A'}")
+            print(f"  • 90th Percentile: {f'${p90:,.0f}' if p90 else 'N/A'}")
+        results["skipped_records"] = skipped
+        if skipped:
+            print(f"⚠️ Skipped {skipped:,} malformed records")
+        return results
+
+    def _sample_insights(self):
         print("\n💡 Job Market Insights:")
         
         # Simulated API and scraping results
@@ -169,15 +1015,39 @@ class JobMarketAnalyzer:
             print(f"{skill}:")
             print(f"  • Demand: {data.get('demand', 'Unknown')}")
             print(f"  • Avg Salary: {data.get('avg_salary', 'N/A')}")
+        return results
 
 # Run analysis
 JobMarketAnalyzer().analyze()
 
+def write_sample_postings(path, rows=50_000):
+    """Generate a fake JSONL job-posting dump to try the streaming analyzer on."""
+    stacks = ["Python and SQL", "JavaScript, React", "Java backend", "python / pandas", "C++ and SQL"]
+    with open(path, "w", encoding="utf-8") as f:
+        for i in range(rows):
+            posting = {
+                "title": f"Developer #{i}",
+                "description": f"We use {random.choice(stacks)} every day.",
+                "salary": f"${random.randint(60, 180) * 1000:,}",
+            }
+            f.write(json.dumps(posting) + "\n")
+
+# Worker processes re-import this file on spawn-based platforms, so only run the
+# multi-process demo from the main script
+if __name__ == "__main__":
+    with tempfile.TemporaryDirectory() as tmp:
+        sample_path = os.path.join(tmp, "postings.jsonl")
+        write_sample_postings(sample_path)
+        JobMarketAnalyzer(["Python", "JavaScript", "SQL", "Java", "C++"]).analyze(sample_path, processes=2)
+        # Real dumps: JobMarketAnalyzer(skills).analyze("postings.csv")
+
 """
 📚 Learning Checklist:
 ✅ Combining APIs with scraping
 ✅ Data analysis basics
 ✅ Presenting insights
+✅ Streaming large datasets across processes
+✅ Mergeable sketches for percentiles
 """
 
 # ==================== 🎓 CONTINUING EDUCATION ====================
@@ -10,7 +10,9 @@ Covers:
 # ================ 1. SQLITE FUNDAMENTALS ================
 print("\n" + "="*60 + "\n💾 1. SQLITE DATABASES\n" + "="*60)
 
+import os
 import sqlite3
+import threading
 from contextlib import closing
 
 """
@@ -20,20 +22,66 @@ from contextlib import closing
 - Ideal for local apps and prototyping
 """
 
+# 🛠️ Shared Connection Management
+class SQLiteConnectionManager:
+    """Hands out one long-lived connection per thread and database file.
+
+    Reusing connections skips connect/teardown, keeps SQLite's page cache warm
+    and lets `cached_statements` reuse prepared statements across calls. Every
+    connection gets the same PRAGMAs; a forked child starts with fresh ones.
+    """
+
+    PRAGMAS = {
+        "journal_mode": "WAL",
+        "synchronous": "NORMAL",
+        "temp_store": "MEMORY",
+        "cache_size": -64_000,  # ~64 MB
+        "foreign_keys": "ON",
+    }
+
+    def __init__(self, cached_statements=256, pragmas=None):
+        self.cached_statements = cached_statements
+        self.pragmas = dict(self.PRAGMAS if pragmas is None else pragmas)
+        self._pid = os.getpid()
+        self._local = threading.local()
+
+    def connection(self, path="library.db"):
+        if os.getpid() != self._pid:  # Never share SQLite handles across fork()
+            self._pid = os.getpid()
+            self._local = threading.local()
+        connections = self._local.__dict__.setdefault("connections", {})
+        conn = connections.get(path)
+        if conn is None:
+            conn = sqlite3.connect(path, cached_statements=self.cached_statements)
+            for name, value in self.pragmas.items():
+                conn.execute(f"PRAGMA {name} = {value}")
+            connections[path] = conn
+        return conn
+
+    def close_all(self):
+        """Close the calling thread's connections."""
+        for conn in self._local.__dict__.pop("connections", {}).values():
+            conn.close()
+
+db = SQLiteConnectionManager()
+
 # 🛠️ Example 1: Creating a Database
+BOOKS_SCHEMA = """
+CREATE TABLE IF NOT EXISTS books (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    title TEXT NOT NULL,
+    author TEXT,
+    year INTEGER
+)
+"""
+
 def create_database():
-    with closing(sqlite3.connect("library.db")) as conn:
+    conn = db.connection("library.db")
+    with conn:  # Commits on success, rolls back on error
         cursor = conn.cursor()
         
         # Create tables
-        cursor.execute("""
-        CREATE TABLE IF NOT EXISTS books (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            title TEXT NOT NULL,
-            author TEXT,
-            year INTEGER
-        )
-        """)
+        cursor.execute(BOOKS_SCHEMA)
         
         # Insert sample data
         books = [
@@ -42,32 +90,242 @@ def create_database():
             ("Python Crash Course", "Eric Matthes", 2015)
         ]
         cursor.executemany("INSERT INTO books (title, author, year) VALUES (?, ?, ?)", books)
-        conn.commit()
     print("✅ Database created with sample books!")
 
 create_database()
 
 # 🛠️ Example 2: Querying Data
+from collections import namedtuple
+
+BookRow = namedtuple("BookRow", "id title author year")  # Lightweight, access by name
+
+def iter_query(conn, sql, params=(), batch_size=1_000):
+    """Yield rows of `sql` with fetchmany(), holding at most one batch in memory."""
+    cursor = conn.execute(sql, params)
+    try:
+        while rows := cursor.fetchmany(batch_size):
+            yield from rows
+    finally:
+        cursor.close()
+
+def iter_books(conn, after_id=0, page_size=1_000, author=None):
+    """Yield books as BookRow tuples in id order using keyset pagination.
+
+    Each page is an index seek (`id > last seen id LIMIT page_size`), so memory
+    stays constant on huge tables, and callers can stop early or resume later
+    by passing the last id they processed as `after_id`. `author` restricts
+    the listing to one author's books.
+    """
+    sql = "SELECT id, title, author, year FROM books WHERE id > ?"
+    filters = ()
+    if author is not None:
+        sql += " AND author = ?"
+        filters = (author,)
+    sql += " ORDER BY id LIMIT ?"
+    while True:
+        page = conn.execute(sql, (after_id, *filters, page_size)).fetchall()
+        yield from map(BookRow._make, page)
+        if len(page) < page_size:
+            return
+        after_id = page[-1][0]
+
 def query_books():
-    with closing(sqlite3.connect("library.db")) as conn:
-        conn.row_factory = sqlite3.Row  # Access columns by name
-        cursor = conn.cursor()
-        
-        print("\nAll Books:")
-        cursor.execute("SELECT * FROM books")
-        for row in cursor.fetchall():
-            print(f"{row['id']}. {row['title']} ({row['year']})")
-        
-        print("\nBooks after 1950:")
-        cursor.execute("SELECT title FROM books WHERE year > ?", (1950,))
-        print([row[0] for row in cursor.fetchall()])
+    conn = db.connection("library.db")
+    
+    print("\nAll Books:")
+    for book in iter_books(conn):
+        print(f"{book.id}. {book.title} ({book.year})")
+    
+    print("\nBooks after 1950:")
+    print([row[0] for row in iter_query(conn, "SELECT title FROM books WHERE year > ?", (1950,))])
 
 query_books()
 
+# 🛠️ Example 2b: Bulk Loading Large Catalogs
+import csv
+import itertools
+import tempfile
+import time
+
+"""
+🔍 Bulk Loading Tips:
+- One transaction per batch instead of per row
+- Loader-time PRAGMAs trade durability for speed while importing
+- Build indexes once after the load, not row by row during it
+"""
+
+LOADER_PRAGMAS = {
+    "journal_mode": "WAL",
+    "synchronous": "OFF",      # Fine for a re-runnable import; per-connection only
+    "temp_store": "MEMORY",
+    "cache_size": -256_000,    # Negative = KiB, so ~256 MB of page cache
+}
+
+def iter_books_csv(path):
+    """Stream (title, author, year) tuples from a CSV with those column headers."""
+    with open(path, newline="", encoding="utf-8") as f:
+        for row in csv.DictReader(f):
+            year = (row.get("year") or "").strip()
+            yield row["title"], row.get("author") or None, int(year) if year else None
+
+def bulk_load_books(rows, db_path="library.db", batch_size=50_000, pragmas=LOADER_PRAGMAS):
+    """Load (title, author, year) rows - an iterable or a CSV path - into `books`.
+
+    Rows are committed in `batch_size` transactions, and secondary indexes are
+    dropped for the load and rebuilt once at the end. Returns the rows loaded.
+    """
+    if isinstance(rows, (str, os.PathLike)):
+        rows = iter_books_csv(rows)
+    rows = iter(rows)
+    loaded = 0
+
+    with closing(sqlite3.connect(db_path, isolation_level=None)) as conn:
+        for name, value in pragmas.items():
+            conn.execute(f"PRAGMA {name} = {value}")
+        conn.execute(BOOKS_SCHEMA)
+
+        indexes = conn.execute(
+            "SELECT name, sql FROM sqlite_master "
+            "WHERE type = 'index' AND tbl_name = 'books' AND sql IS NOT NULL"
+        ).fetchall()
+        for name, _ in indexes:
+            conn.execute(f'DROP INDEX "{name}"')
+
+        try:
+            while batch := list(itertools.islice(rows, batch_size)):
+                conn.execute("BEGIN")
+                try:
+                    conn.executemany("INSERT INTO books (title, author, year) VALUES (?, ?, ?)", batch)
+                    conn.execute("COMMIT")
+                except BaseException:
+                    conn.execute("ROLLBACK")
+                    raise
+                loaded += len(batch)
+        finally:
+            for _, sql in indexes:  # Rebuilt with one sorted pass each
+                conn.execute(sql)
+            conn.execute("PRAGMA optimize")
+    return loaded
+
+def synthetic_books(n):
+    """Fake (title, author, year) rows for benchmarks."""
+    for i in range(n):
+        yield f"Book {i}", f"Author {i % 5_000}", 1900 + i % 125
+
+def benchmark_bulk_load(total_rows=200_000, batch_sizes=(1_000, 10_000, 100_000)):
+    print(f"\nBulk load of {total_rows:,} rows:")
+    with tempfile.TemporaryDirectory() as tmp:
+        for batch_size in batch_sizes:
+            db_path = os.path.join(tmp, f"bulk_{batch_size}.db")
+            started = time.perf_counter()
+            loaded = bulk_load_books(synthetic_books(total_rows), db_path, batch_size)
+            elapsed = time.perf_counter() - started
+            print(f"  batch_size={batch_size:>7,}: {loaded / elapsed:>12,.0f} rows/sec")
+
+with tempfile.TemporaryDirectory() as tmp:
+    loaded = bulk_load_books(synthetic_books(10_000), os.path.join(tmp, "bulk_demo.db"), batch_size=2_500)
+    print(f"\nBulk-loaded {loaded:,} books in batches of 2,500")
+
+# Benchmarks take a while, so they only run when this file is the main script
+if __name__ == "__main__":
+    benchmark_bulk_load()
+    # benchmark_bulk_load(10_000_000)  # Full-size catalog run (takes a while)
+
+# 🛠️ Example 2c: Reusing Connections
+def benchmark_connections(queries=10_000, db_path="library.db"):
+    sql = "SELECT title FROM books WHERE id = ?"
+
+    started = time.perf_counter()
+    for i in range(queries):
+        with closing(sqlite3.connect(db_path)) as conn:
+            conn.execute(sql, (i % 3 + 1,)).fetchone()
+    fresh = time.perf_counter() - started
+
+    manager = SQLiteConnectionManager()
+    started = time.perf_counter()
+    for i in range(queries):
+        manager.connection(db_path).execute(sql, (i % 3 + 1,)).fetchone()
+    pooled = time.perf_counter() - started
+    manager.close_all()
+
+    print(f"\n{queries:,} small queries:")
+    print(f"  connect per query:  {fresh:.2f}s ({fresh / queries * 1e6:.0f} µs/query)")
+    print(f"  shared connection:  {pooled:.2f}s ({pooled / queries * 1e6:.0f} µs/query)")
+
+if __name__ == "__main__":
+    benchmark_connections()
+
+# 🛠️ Example 2d: Indexes and Query Plans
+import statistics
+
+BOOK_INDEXES = {
+    # Covers `SELECT title ... WHERE year > ?` without visiting the table
+    "idx_books_year_title": "CREATE INDEX IF NOT EXISTS idx_books_year_title ON books (year, title)",
+    # Author lookups; year/title (plus the implicit rowid id) make listings covering
+    "idx_books_author": "CREATE INDEX IF NOT EXISTS idx_books_author ON books (author, year, title)",
+}
+
+STANDARD_BOOK_QUERIES = {
+    "titles after year": ("SELECT title FROM books WHERE year > ?", (2015,)),
+    "books by author": ("SELECT id, title, year FROM books WHERE author = ?", ("Author 42",)),
+    "count since year": ("SELECT COUNT(*) FROM books WHERE year >= ?", (2020,)),
+}
+
+def create_book_indexes(conn):
+    with conn:
+        for sql in BOOK_INDEXES.values():
+            conn.execute(sql)
+        conn.execute("ANALYZE books")  # Give the planner fresh statistics
+
+def explain_query_plan(conn, sql, params=()):
+    return [row[3] for row in conn.execute(f"EXPLAIN QUERY PLAN {sql}", params)]
+
+def index_advisor(conn, queries=STANDARD_BOOK_QUERIES):
+    """Print the plan of each standard query and flag full table scans."""
+    plans = {}
+    for name, (sql, params) in queries.items():
+        plans[name] = plan = explain_query_plan(conn, sql, params)
+        full_scan = any(step.startswith("SCAN") and "INDEX" not in step for step in plan)
+        print(f"{'⚠️ full scan' if full_scan else '✅ indexed'}  {name}: {' | '.join(plan)}")
+    return plans
+
+def benchmark_book_indexes(total_rows=5_000_000, repeats=5):
+    def time_queries(conn):
+        timings = {}
+        for name, (sql, params) in STANDARD_BOOK_QUERIES.items():
+            samples = []
+            for _ in range(repeats):
+                started = time.perf_counter()
+                conn.execute(sql, params).fetchall()
+                samples.append(time.perf_counter() - started)
+            timings[name] = statistics.median(samples)
+        return timings
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, "index_bench.db")
+        bulk_load_books(synthetic_books(total_rows), db_path, batch_size=100_000)
+        with closing(sqlite3.connect(db_path)) as conn:
+            print(f"\nQuery latency on {total_rows:,} books (median of {repeats}):")
+            scan = time_queries(conn)
+            create_book_indexes(conn)
+            indexed = time_queries(conn)
+            for name in STANDARD_BOOK_QUERIES:
+                print(f"  {name:<18} full scan {scan[name] * 1000:>8.2f} ms"
+                      f"   indexed {indexed[name] * 1000:>8.2f} ms")
+            index_advisor(conn)
+
+create_book_indexes(db.connection("library.db"))
+print("\nQuery plans for library.db:")
+index_advisor(db.connection("library.db"))
+if __name__ == "__main__":
+    benchmark_book_indexes(200_000)
+    # benchmark_book_indexes()  # Full 5M-row comparison (takes a minute or so)
+
 # ================ 2. SQLALCHEMY ORM ================
 print("\n" + "="*60 + "\n🔮 2. SQLALCHEMY ORM\n" + "="*60)
 
-from sqlalchemy import create_engine, Column, Integer, String
+from sqlalchemy import (create_engine, bindparam, insert, select, update, Column, Float, Index,
+                        Integer, MetaData, String, Table)
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 
@@ -88,15 +346,42 @@ Base.metadata.create_all(engine)
 Session = sessionmaker(bind=engine)
 
 # 🛠️ Example 4: ORM Operations
+def save_books(session, rows, mode="auto", need_identities=False):
+    """Insert book dicts using the cheapest persistence path that fits.
+
+    - "orm": Book objects through add_all (full unit of work, ids filled in)
+    - "mappings": session.bulk_insert_mappings (no objects, light bookkeeping)
+    - "core": insert() executemany on the session's connection (fastest)
+    "auto" picks "orm" only when the caller needs the new objects or ids back.
+    Returns the Book objects in "orm" mode, otherwise the row count. The
+    caller commits.
+    """
+    rows = list(rows)
+    if mode == "auto":
+        mode = "orm" if need_identities else "core"
+    if mode == "orm":
+        books = [Book(**row) for row in rows]
+        session.add_all(books)
+        session.flush()  # Assigns primary keys
+        return books
+    if mode == "mappings":
+        session.bulk_insert_mappings(Book, rows)
+    elif mode == "core":
+        if rows:
+            session.execute(insert(Book.__table__), rows)
+    else:
+        raise ValueError(f"Unknown save mode: {mode!r}")
+    return len(rows)
+
 def orm_demo():
     session = Session()
     
     # Add new books
     new_books = [
-        Book(title="Clean Code", author="Robert Martin", year=2008),
-        Book(title="Design Patterns", author="Gang of Four", year=1994)
+        {"title": "Clean Code", "author": "Robert Martin", "year": 2008},
+        {"title": "Design Patterns", "author": "Gang of Four", "year": 1994}
     ]
-    session.add_all(new_books)
+    save_books(session, new_books)  # Ids aren't needed, so this takes the Core path
     session.commit()
     
     # Query data
@@ -109,6 +394,176 @@ def orm_demo():
 
 orm_demo()
 
+def benchmark_book_inserts(sizes=(10_000, 100_000, 1_000_000), modes=("orm", "mappings", "core")):
+    print("\nInsert time by persistence mode:")
+    with tempfile.TemporaryDirectory() as tmp:
+        for size in sizes:
+            rows = [{"title": title, "author": author, "year": year}
+                    for title, author, year in synthetic_books(size)]
+            timings = []
+            for mode in modes:
+                bench_engine = create_engine(f"sqlite:///{os.path.join(tmp, f'{mode}_{size}.db')}")
+                Base.metadata.create_all(bench_engine)
+                session = sessionmaker(bind=bench_engine)()
+                started = time.perf_counter()
+                save_books(session, rows, mode=mode)
+                session.commit()
+                timings.append(f"{mode} {time.perf_counter() - started:6.2f}s")
+                session.close()
+                bench_engine.dispose()
+            print(f"  {size:>9,} rows: " + " | ".join(timings))
+
+if __name__ == "__main__":
+    benchmark_book_inserts(sizes=(10_000,))
+    # benchmark_book_inserts()  # 10k / 100k / 1M rows (the ORM run at 1M takes a while)
+
+# 🛠️ Example 4b: Caching Query Results
+import re
+from collections import OrderedDict
+from sqlalchemy import event
+from sqlalchemy.orm import loading, Session as OrmSession
+from sqlalchemy.sql.util import find_tables
+
+_WRITE_SQL = re.compile(
+    r"^\s*(?:INSERT(?:\s+OR\s+\w+)?\s+INTO|REPLACE\s+INTO|UPDATE(?:\s+OR\s+\w+)?|DELETE\s+FROM)"
+    r"\s+[\"`\[]?(\w+)",
+    re.IGNORECASE,
+)
+
+class QueryResultCache:
+    """Read-through cache for SELECTs run through a sessionmaker's sessions.
+
+    Entries are keyed by compiled SQL plus bound parameters, kept in an LRU of
+    `maxsize` entries and expire after `ttl` seconds. When the engine commits
+    an INSERT/UPDATE/DELETE, entries reading the touched tables are dropped;
+    until then, queries on those tables bypass the cache so nobody sees
+    uncommitted rows. Results are loaded through a throwaway session, so the
+    cache holds detached, unmodified copies, which are merged into the
+    caller's session.
+    """
+
+    def __init__(self, maxsize=512, ttl=300.0):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries = OrderedDict()  # key -> (expires_at, tables, frozen result)
+        self._dirty = {}  # table -> connections holding uncommitted writes to it
+        self._lock = threading.Lock()
+        self.hits = self.misses = self.bypassed = self.invalidations = self.evictions = 0
+
+    def install(self, session_factory, engine):
+        event.listen(session_factory, "do_orm_execute", self._on_orm_execute)
+        event.listen(engine, "before_cursor_execute", self._on_cursor_execute)
+        event.listen(engine, "commit", self._on_commit)
+        event.listen(engine, "rollback", self._on_rollback)
+        return self
+
+    def _on_orm_execute(self, state):
+        # Attribute refreshes and lazy loads must always see the database
+        if not state.is_select or state.is_column_load or state.is_relationship_load:
+            return None
+        tables = frozenset(table.name for table in find_tables(state.statement, include_crud=False))
+        compiled = state.statement.compile(dialect=state.session.get_bind().dialect)
+        key = (str(compiled), repr(sorted(compiled.params.items())), repr(state.parameters))
+
+        with self._lock:
+            if any(self._dirty.get(table) for table in tables):
+                self.bypassed += 1
+                return None
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] > time.monotonic():
+                self._entries.move_to_end(key)
+                self.hits += 1
+                frozen = entry[2]
+            else:
+                self.misses += 1
+                frozen = None
+
+        if frozen is None:
+            # Not state.invoke_statement(): that returns this session's live
+            # objects, and an unflushed edit to one would reach every session
+            with OrmSession(bind=state.session.get_bind()) as scratch:
+                frozen = scratch.execute(
+                    state.statement, state.parameters,
+                    execution_options=state.local_execution_options,
+                ).freeze()
+            with self._lock:
+                if not any(self._dirty.get(table) for table in tables):
+                    self._entries[key] = (time.monotonic() + self.ttl, tables, frozen)
+                    self._entries.move_to_end(key)
+                    while len(self._entries) > self.maxsize:
+                        self._entries.popitem(last=False)
+                        self.evictions += 1
+        merged = loading.merge_frozen_result(state.session, state.statement, frozen, load=False)
+        return merged()  # A fresh Result over objects merged into this session
+
+    def _on_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        match = _WRITE_SQL.match(statement)
+        if match:
+            table = match.group(1)
+            pending = conn.info.setdefault("query_cache_pending", set())
+            with self._lock:
+                if table not in pending:
+                    pending.add(table)
+                    self._dirty[table] = self._dirty.get(table, 0) + 1
+
+    def _finish(self, conn, invalidate):
+        pending = conn.info.pop("query_cache_pending", set())
+        if not pending:
+            return
+        with self._lock:
+            for table in pending:
+                self._dirty[table] -= 1
+            if invalidate:
+                stale = [key for key, (_, tables, _) in self._entries.items() if tables & pending]
+                for key in stale:
+                    del self._entries[key]
+                self.invalidations += len(stale)
+
+    def _on_commit(self, conn):
+        self._finish(conn, invalidate=True)
+
+    def _on_rollback(self, conn):
+        self._finish(conn, invalidate=False)  # Nothing changed, so cached rows are still right
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "bypassed": self.bypassed,
+                "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+                "invalidations": self.invalidations,
+                "evictions": self.evictions,
+            }
+
+query_cache = QueryResultCache(ttl=60).install(Session, engine)
+
+def query_cache_demo(repeats=100):
+    session = Session()
+    recent = lambda: session.query(Book).filter(Book.year > 2000).all()
+    for _ in range(repeats):
+        recent()  # First call misses, the rest are served from the cache
+    save_books(session, [{"title": "Refactoring", "author": "Martin Fowler", "year": 2018}])
+    session.commit()  # Commit invalidates every cached query on books_orm
+    print(f"\nRecent books after insert: {len(recent())}")
+    session.close()
+
+    # One session's unflushed edit must neither leak into nor break another's
+    # hit, even when that session's query is the miss that filled the cache
+    editor, reader = Session(autoflush=False), Session()
+    modern = lambda s: s.query(Book).filter(Book.year >= 2010).all()
+    modern(editor)[0].title = "Unsaved edit"
+    titles = [book.title for book in modern(reader)]
+    print(f"Other session sees the unsaved edit: {'Unsaved edit' in titles}")
+    editor.rollback()
+    editor.close()
+    reader.close()
+    print(f"Query cache: {query_cache.stats()}")
+
+query_cache_demo()
+
 # ================ 3. PANDAS DATA ANALYSIS ================
 print("\n" + "="*60 + "\n📊 3. PANDAS DATA ANALYSIS\n" + "="*60)
 
@@ -116,29 +571,114 @@ import pandas as pd
 import numpy as np
 
 # 🛠️ Example 5: Basic DataFrame Operations
-def pandas_basics():
-    # Create DataFrame from SQL
-    with closing(sqlite3.connect("library.db")) as conn:
+def library_stats(chunksize=None, parquet_root=None):
+    """Book counts, year range, authors and century split for the library.
+
+    With `chunksize`, the table is streamed and each chunk is folded into
+    running aggregates, so only one chunk is ever in memory. With
+    `parquet_root`, the same fold runs over the Parquet snapshot's record
+    batches. Every path uses the same fold and gives identical results.
+    """
+    columns = ["id", "author", "year"]
+    if parquet_root is not None:
+        batches = books_dataset(parquet_root).to_batches(columns=columns)
+        chunks = (batch.to_pandas() for batch in batches)
+    else:
+        conn = db.connection("library.db")
+        sql = "SELECT id, author, year FROM books"
+        chunks = [pd.read_sql(sql, conn)] if chunksize is None else pd.read_sql(sql, conn, chunksize=chunksize)
+
+    stats = {"total": 0, "oldest": None, "newest": None, "authors": {}, "by_century": {}}
+    for df in chunks:
+        stats["total"] += len(df)
+        for key, value, pick in (("oldest", df['year'].min(), min), ("newest", df['year'].max(), max)):
+            if pd.notna(value):
+                value = int(value)
+                stats[key] = value if stats[key] is None else pick(stats[key], value)
+        # Remember each author's lowest id so the list comes out in table order;
+        # NULL authors are kept (as None), as unique() does
+        for author, first_id in df.groupby('author', sort=False, dropna=False)['id'].min().items():
+            author = None if pd.isna(author) else author
+            if author not in stats["authors"] or first_id < stats["authors"][author]:
+                stats["authors"][author] = int(first_id)
+        # Add new column
+        df['century'] = np.where(df['year'] < 2000, '20th', '21st')
+        for century, count in df['century'].value_counts().items():
+            stats["by_century"][century] = stats["by_century"].get(century, 0) + int(count)
+
+    stats["authors"] = sorted(stats["authors"], key=stats["authors"].get)
+    stats["by_century"] = dict(sorted(stats["by_century"].items()))
+    return stats
+
+def pandas_basics(chunksize=None):
+    conn = db.connection("library.db")
+    if chunksize is None:
+        # Create DataFrame from SQL
         df = pd.read_sql("SELECT * FROM books", conn)
-    
+        
+        print("\nLibrary DataFrame:")
+        print(df.head())
+        
+        # Data analysis
+        print("\nBasic Stats:")
+        print(f"Total books: {len(df)}")
+        print(f"Oldest book: {df['year'].min()}")
+        print(f"Authors: {df['author'].unique().tolist()}")
+        
+        # Add new column
+        df['century'] = np.where(df['year'] < 2000, '20th', '21st')
+        print("\nBooks by Century:")
+        print(df[['title', 'century']])
+        return
+
+    # Streamed: a per-title listing would be as large as the table, so
+    # summarize the century split as counts instead
     print("\nLibrary DataFrame:")
-    print(df.head())
+    print(pd.read_sql("SELECT * FROM books ORDER BY id LIMIT 5", conn))
     
-    # Data analysis
+    stats = library_stats(chunksize)
     print("\nBasic Stats:")
-    print(f"Total books: {len(df)}")
-    print(f"Oldest book: {df['year'].min()}")
-    print(f"Authors: {df['author'].unique().tolist()}")
+    print(f"Total books: {stats['total']}")
+    print(f"Oldest book: {stats['oldest']}")
+    print(f"Authors: {stats['authors']}")
     
-    # Add new column
-    df['century'] = np.where(df['year'] < 2000, '20th', '21st')
     print("\nBooks by Century:")
-    print(df[['title', 'century']])
+    for century, count in stats["by_century"].items():
+        print(f"{century}: {count}")
 
 pandas_basics()
 
 # 🛠️ Example 6: Advanced Analysis
-def pandas_analysis():
+def optimize_dtypes(df, categoricals=("title", "author", "category"), downcast_floats=False):
+    """Return a copy with integers downcast and repeated strings as categoricals.
+
+    Floats stay float64 unless `downcast_floats` is set, because float32
+    can't hold prices exactly and sums drift over millions of rows.
+    """
+    out = df.copy()
+    for col in out.columns:
+        series = out[col]
+        if col in categoricals and series.dtype == object:
+            out[col] = series.astype("category")
+        elif pd.api.types.is_integer_dtype(series):
+            out[col] = pd.to_numeric(series, downcast="integer")
+        elif downcast_floats and pd.api.types.is_float_dtype(series):
+            out[col] = pd.to_numeric(series, downcast="float")
+    return out
+
+def memory_report(before, after):
+    """Per-column dtype and memory (deep) before and after optimize_dtypes."""
+    report = pd.DataFrame({
+        "dtype_before": before.dtypes.astype(str),
+        "dtype_after": after.dtypes.astype(str),
+        "mb_before": before.memory_usage(deep=True, index=False) / 1e6,
+        "mb_after": after.memory_usage(deep=True, index=False) / 1e6,
+    })
+    report.loc["TOTAL"] = ["", "", report["mb_before"].sum(), report["mb_after"].sum()]
+    report["saved_%"] = (1 - report["mb_after"] / report["mb_before"]) * 100
+    return report.round(2)
+
+def sample_sales():
     # Create sample sales data
     sales_data = {
         'book_id': [1, 2, 3, 1, 2],
@@ -147,63 +687,443 @@ def pandas_analysis():
     }
     sales = pd.DataFrame(sales_data)
     sales['sale_date'] = pd.to_datetime(sales['sale_date'])
-    
-    # Merge with book data
-    with closing(sqlite3.connect("library.db")) as conn:
+    return sales
+
+def revenue_by_title(sales=None, chunksize=None, parquet_root=None):
+    """Revenue per book title.
+
+    In memory, `sales` is merged with the books table. With `chunksize`, the
+    `sales` table (see store_sample_sales) is joined inside SQLite and
+    streamed, and each chunk's per-title sums are added to a running total.
+    With `parquet_root`, only the needed columns are read from the Parquet
+    snapshot. Those two paths read their own sales data, so passing `sales`
+    as well is an error.
+    """
+    if sales is not None and (chunksize is not None or parquet_root is not None):
+        raise ValueError("sales is read from the sales table or snapshot when "
+                         "chunksize or parquet_root is given; store it there first")
+    if sales is None and chunksize is None and parquet_root is None:
+        raise ValueError("sales is required for the in-memory path")
+    conn = db.connection("library.db")
+    if parquet_root is not None:
+        sales = sales_dataset(parquet_root).to_table(columns=["book_id", "price"]).to_pandas()
+        books = books_dataset(parquet_root).to_table(columns=["id", "title"]).to_pandas()
+    elif chunksize is None:
         books = pd.read_sql("SELECT id, title FROM books", conn)
-    
-    merged = pd.merge(sales, books, left_on='book_id', right_on='id')
+    if chunksize is None:
+        # Merge with book data: compact dtypes, then join on a sorted index
+        books = optimize_dtypes(books).set_index('id').sort_index()
+        sales = optimize_dtypes(sales).sort_values('book_id')
+        merged = sales.join(books, on='book_id', how='inner')
+        revenue = merged.groupby('title', observed=True)['price'].sum()
+        revenue.index = revenue.index.astype(object)
+    else:
+        revenue = pd.Series(dtype=float, name='price')
+        revenue.index.name = 'title'
+        chunks = pd.read_sql(
+            "SELECT b.title, s.price FROM sales AS s JOIN books AS b ON b.id = s.book_id",
+            conn, chunksize=chunksize,
+        )
+        for chunk in chunks:
+            revenue = revenue.add(chunk.groupby('title')['price'].sum(), fill_value=0)
+    # Round to cents so summation order can't change the result; ties sorted by title
+    return revenue.round(2).sort_index().sort_values(ascending=False, kind="stable")
+
+def pandas_analysis(chunksize=None):
+    if chunksize is None:
+        revenue = revenue_by_title(sample_sales())
+    else:
+        revenue = revenue_by_title(chunksize=chunksize)  # Streams the stored sales table
     
     print("\nSales Analysis:")
-    print(f"Total revenue: ${merged['price'].sum():.2f}")
+    print(f"Total revenue: ${revenue.sum():.2f}")
     print("\nTop Selling Books:")
-    print(merged.groupby('title')['price'].sum().sort_values(ascending=False))
+    print(revenue)
 
 pandas_analysis()
 
+# 🛠️ Example 6a: Memory-Optimized DataFrames
+def benchmark_sales_memory(rows=10_000_000, n_books=100_000, seed=0):
+    rng = np.random.default_rng(seed)
+    books = pd.DataFrame({
+        'id': np.arange(1, n_books + 1),
+        'title': [f"Book {i}" for i in range(n_books)],
+        'author': [f"Author {i % 5_000}" for i in range(n_books)],
+    })
+    sales = pd.DataFrame({
+        'book_id': rng.integers(1, n_books + 1, rows),
+        'sale_date': pd.Timestamp("2023-01-01") + pd.to_timedelta(rng.integers(0, 365, rows), unit="D"),
+        'price': rng.choice([9.99, 12.99, 24.99, 39.99], rows),
+        'category': rng.choice(["Fiction", "Tech", "History", "Kids"], rows).astype(object),
+    })
+
+    started = time.perf_counter()
+    baseline = pd.merge(sales, books, left_on='book_id', right_on='id').groupby('title')['price'].sum()
+    baseline_time = time.perf_counter() - started
+
+    started = time.perf_counter()
+    small_sales = optimize_dtypes(sales).sort_values('book_id')
+    small_books = optimize_dtypes(books).set_index('id').sort_index()
+    convert_time = time.perf_counter() - started
+
+    started = time.perf_counter()
+    optimized = small_sales.join(small_books, on='book_id', how='inner').groupby('title', observed=True)['price'].sum()
+    optimized_time = time.perf_counter() - started
+
+    print(f"\nSales table memory ({rows:,} rows):")
+    print(memory_report(sales, small_sales))
+    print(f"Merge + groupby: default {baseline_time:.2f}s, "
+          f"optimized {optimized_time:.2f}s (+{convert_time:.2f}s one-off conversion)")
+    print(f"Same totals: {np.allclose(baseline.sort_index(), optimized.sort_index())}")
+
+if __name__ == "__main__":
+    benchmark_sales_memory(1_000_000)
+    # benchmark_sales_memory()  # Full 10M-row run (needs a few GB of RAM)
+
+# 🛠️ Example 6b: Out-of-Core Analysis
+def store_sample_sales():
+    conn = db.connection("library.db")
+    with conn:
+        sample_sales().to_sql("sales", conn, if_exists="replace", index=False)
+
+store_sample_sales()
+chunked_matches = (
+    library_stats(chunksize=2) == library_stats()
+    and revenue_by_title(chunksize=2).equals(revenue_by_title(sample_sales()))
+)
+print(f"\nChunked results match in-memory results: {chunked_matches}")
+# pandas_basics(chunksize=100_000); pandas_analysis(chunksize=100_000)  # Tables larger than RAM
+
+# 🛠️ Example 6c: Columnar Parquet Snapshots
+import shutil
+
+try:
+    import pyarrow as pa
+    import pyarrow.dataset as ds
+    import pyarrow.parquet as pq
+except ImportError:  # Optional: pip install pyarrow
+    pa = None
+
+"""
+🔍 Why Parquet for analytics:
+- Columnar: read only the columns a query needs
+- Row-group statistics + partition folders let filters skip data
+- No per-row conversion from SQLite rows to Python objects
+"""
+
+if pa is not None:
+    PARQUET_SCHEMAS = {
+        "books": pa.schema([("id", pa.int64()), ("title", pa.string()), ("author", pa.string()),
+                            ("year", pa.int64()), ("decade", pa.int64())]),
+        "sales": pa.schema([("book_id", pa.int64()), ("sale_date", pa.string()),
+                            ("price", pa.float64()), ("month", pa.string())]),
+    }
+
+def export_to_parquet(out_dir="library_parquet", db_path="library.db", chunksize=500_000):
+    """Snapshot `books` (partitioned by decade) and `sales` (by month) into Parquet.
+
+    An existing `out_dir` is replaced only if it holds nothing but a previous
+    snapshot's books/ and sales/ directories; anything else raises ValueError.
+    """
+    exports = {
+        "books": ("SELECT id, title, author, year FROM books", "decade",
+                  lambda df: (df['year'] // 10 * 10).astype("Int64")),
+        "sales": ("SELECT book_id, sale_date, price FROM sales", "month",
+                  lambda df: df['sale_date'].astype(str).str[:7]),
+    }
+    out_dir = os.path.abspath(out_dir)
+    if os.path.lexists(out_dir):  # Only ever replace a previous snapshot
+        if not os.path.isdir(out_dir) or any(
+            entry.name not in exports or not entry.is_dir(follow_symlinks=False)
+            for entry in os.scandir(out_dir)
+        ):
+            raise ValueError(f"{out_dir} exists and is not a Parquet snapshot; refusing to replace it")
+
+    # Build the new snapshot beside the old one, so a failed export leaves it intact
+    staging = tempfile.mkdtemp(prefix=".parquet-", dir=os.path.dirname(out_dir))
+    try:
+        with closing(sqlite3.connect(db_path)) as conn:
+            tables = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+            for name, (sql, partition, derive) in exports.items():
+                if name not in tables:
+                    continue
+                for i, chunk in enumerate(pd.read_sql(sql, conn, chunksize=chunksize)):
+                    if name == "sales":
+                        chunk['sale_date'] = chunk['sale_date'].astype(str)
+                    chunk[partition] = derive(chunk)
+                    table = pa.Table.from_pandas(chunk, schema=PARQUET_SCHEMAS[name], preserve_index=False)
+                    pq.write_to_dataset(table, os.path.join(staging, name), partition_cols=[partition],
+                                        basename_template=f"chunk{i}-{{i}}.parquet")
+    except BaseException:
+        shutil.rmtree(staging, ignore_errors=True)
+        raise
+
+    retired = f"{staging}-old"
+    if os.path.lexists(out_dir):
+        os.rename(out_dir, retired)
+    os.rename(staging, out_dir)
+    shutil.rmtree(retired, ignore_errors=True)
+
+def books_dataset(root="library_parquet"):
+    return ds.dataset(os.path.join(root, "books"), format="parquet", partitioning="hive",
+                      schema=PARQUET_SCHEMAS["books"])
+
+def sales_dataset(root="library_parquet"):
+    return ds.dataset(os.path.join(root, "sales"), format="parquet", partitioning="hive",
+                      schema=PARQUET_SCHEMAS["sales"])
+
+def titles_after(year, parquet_root=None):
+    """Titles of books published after `year`, from SQLite or the Parquet snapshot."""
+    if parquet_root is None:
+        return pd.read_sql("SELECT title FROM books WHERE year > ?", db.connection("library.db"),
+                           params=(year,))['title'].tolist()
+    # The decade test prunes whole partitions; the year test uses row-group statistics
+    predicate = (ds.field("decade") >= year // 10 * 10) & (ds.field("year") > year)
+    return books_dataset(parquet_root).to_table(columns=["title"], filter=predicate).column("title").to_pylist()
+
+def benchmark_parquet(total_rows=10_000_000, year=2015):
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, "columnar_bench.db")
+        root = os.path.join(tmp, "parquet")
+        bulk_load_books(synthetic_books(total_rows), db_path, batch_size=200_000)
+        started = time.perf_counter()
+        export_to_parquet(root, db_path)
+        export_time = time.perf_counter() - started
+
+        with closing(sqlite3.connect(db_path)) as conn:
+            queries = {
+                f"titles after {year}": (
+                    lambda: pd.read_sql("SELECT title FROM books WHERE year > ?", conn, params=(year,)),
+                    lambda: books_dataset(root).to_table(
+                        columns=["title"],
+                        filter=(ds.field("decade") >= year // 10 * 10) & (ds.field("year") > year),
+                    ).to_pandas(),
+                ),
+                "author + year columns": (
+                    lambda: pd.read_sql("SELECT author, year FROM books", conn),
+                    lambda: books_dataset(root).to_table(columns=["author", "year"]).to_pandas(),
+                ),
+            }
+            print(f"\nSQLite vs Parquet on {total_rows:,} books (export took {export_time:.1f}s):")
+            for name, (from_sqlite, from_parquet) in queries.items():
+                started = time.perf_counter()
+                rows = len(from_sqlite())
+                sqlite_time = time.perf_counter() - started
+                started = time.perf_counter()
+                from_parquet()
+                parquet_time = time.perf_counter() - started
+                print(f"  {name:<22} {rows:>11,} rows   sqlite {sqlite_time:6.2f}s   parquet {parquet_time:6.2f}s")
+
+if pa is not None:
+    export_to_parquet()
+    parquet_matches = (
+        library_stats(parquet_root="library_parquet") == library_stats()
+        and revenue_by_title(parquet_root="library_parquet").equals(revenue_by_title(sample_sales()))
+        and sorted(titles_after(1950, "library_parquet")) == sorted(titles_after(1950))
+    )
+    print(f"Parquet results match SQLite results: {parquet_matches}")
+    if __name__ == "__main__":
+        benchmark_parquet(500_000)
+        # benchmark_parquet()  # Full 10M-row comparison
+else:
+    print("\nNote: install pyarrow to try the Parquet examples (pip install pyarrow)")
+
 # ================ 🏆 4. REAL-WORLD PROJECTS ================
 print("\n" + "="*60 + "\n🏆 4. REAL-WORLD PROJECTS\n" + "="*60)
 
 # 🔧 Project 1: Personal Finance Tracker
+TRANSACTIONS_SCHEMA = """
+CREATE TABLE IF NOT EXISTS transactions (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    date TEXT NOT NULL,
+    description TEXT,
+    amount REAL,
+    category TEXT
+)
+"""
+
+# Running totals per category and month, kept in step with `transactions`
+TRANSACTION_SUMMARY_SCHEMA = """
+CREATE TABLE IF NOT EXISTS transaction_summary (
+    category TEXT NOT NULL,
+    month TEXT NOT NULL,
+    total REAL NOT NULL DEFAULT 0,
+    n INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (category, month)
+)
+"""
+
+INSERT_TRANSACTION = (
+    "INSERT INTO transactions (date, description, amount, category) "
+    "VALUES (:date, :description, :amount, :category)"
+)
+
+UPSERT_TRANSACTION_SUMMARY = """
+INSERT INTO transaction_summary (category, month, total, n)
+VALUES (COALESCE(:category, 'Uncategorized'), substr(:date, 1, 7), COALESCE(:amount, 0), 1)
+ON CONFLICT (category, month) DO UPDATE SET
+    total = total + excluded.total,
+    n = n + excluded.n
+"""
+
+REBUILD_TRANSACTION_SUMMARY = """
+INSERT INTO transaction_summary (category, month, total, n)
+SELECT COALESCE(category, 'Uncategorized'), substr(date, 1, 7), TOTAL(amount), COUNT(*)
+FROM transactions
+GROUP BY 1, 2
+"""
+
+# Natural key used to skip rows that were already imported
+TRANSACTIONS_NATURAL_KEY_INDEX = (
+    "CREATE INDEX IF NOT EXISTS idx_transactions_natural ON transactions (date, amount, description)"
+)
+
+# Staged rows -> transactions, skipping natural-key duplicates (in the file or already stored)
+MERGE_IMPORTED_TRANSACTIONS = """
+INSERT INTO transactions (date, description, amount, category)
+SELECT s.date, s.description, s.amount, MIN(s.category)
+FROM transactions_import AS s
+WHERE NOT EXISTS (
+    SELECT 1 FROM transactions AS t
+    WHERE t.date = s.date AND t.amount = s.amount AND t.description IS s.description
+)
+GROUP BY s.date, s.description, s.amount
+"""
+
+# Fold the rows with ids in [:first_id, :last_id] into the running totals
+ADD_TO_TRANSACTION_SUMMARY = """
+INSERT INTO transaction_summary (category, month, total, n)
+SELECT COALESCE(category, 'Uncategorized'), substr(date, 1, 7), TOTAL(amount), COUNT(*)
+FROM transactions
+WHERE id BETWEEN :first_id AND :last_id
+GROUP BY 1, 2
+ON CONFLICT (category, month) DO UPDATE SET
+    total = total + excluded.total,
+    n = n + excluded.n
+"""
+
+CATEGORY_REPORT = """
+SELECT category, SUM(total) AS amount, SUM(n) AS n
+FROM transaction_summary
+GROUP BY category
+"""
+
+import_metadata = MetaData()
+transactions_import = Table(
+    "transactions_import", import_metadata,
+    Column("date", String, nullable=False),
+    Column("description", String),
+    Column("amount", Float, nullable=False),
+    Column("category", String),
+    prefixes=["TEMPORARY"],
+)
+
+def _normalize_amounts(values):
+    """'$1,234.50' -> 1234.5 and accounting-style '(45.00)' -> -45.0; junk -> NaN."""
+    text = values.astype(str).str.strip()
+    negative = text.str.startswith("(") & text.str.endswith(")")
+    amounts = pd.to_numeric(text.str.replace(r"[^0-9.\-]", "", regex=True), errors="coerce")
+    return amounts.where(~negative, -amounts.abs())
+
 class FinanceTracker:
-    def __init__(self):
-        self.engine = create_engine('sqlite:///finance.db')
+    def __init__(self, db_url='sqlite:///finance.db'):
+        self.engine = create_engine(db_url)
         self._setup_database()
     
     def _setup_database(self):
-        with self.engine.connect() as conn:
-            conn.execute("""
-            CREATE TABLE IF NOT EXISTS transactions (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                date TEXT NOT NULL,
-                description TEXT,
-                amount REAL,
-                category TEXT
-            )
-            """)
+        with self.engine.begin() as conn:
+            has_summary = conn.execute(
+                "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'transaction_summary'"
+            ).first() is not None
+            conn.execute(TRANSACTIONS_SCHEMA)
+            conn.execute(TRANSACTION_SUMMARY_SCHEMA)
+            conn.execute(TRANSACTIONS_NATURAL_KEY_INDEX)
+        if not has_summary:
+            self.rebuild_summary()  # Backfill databases created before the summary existed
     
     def add_transaction(self, date, description, amount, category):
-        with self.engine.connect() as conn:
-            conn.execute(
-                "INSERT INTO transactions (date, description, amount, category) VALUES (?, ?, ?, ?)",
-                (date, description, amount, category)
-            )
+        row = {"date": date, "description": description, "amount": amount, "category": category}
+        with self.engine.begin() as conn:  # Row and summary commit (or fail) together
+            conn.execute(INSERT_TRANSACTION, row)
+            conn.execute(UPSERT_TRANSACTION_SUMMARY, row)
         print("✅ Transaction added!")
     
+    def import_csv(self, path, chunksize=50_000, columns=None, date_format=None, dayfirst=False):
+        """Stream a bank export into `transactions` in batched transactions.
+
+        Dates are normalized to YYYY-MM-DD and amounts to floats; rows where
+        either can't be parsed are rejected. Rows matching an existing
+        (date, description, amount) are skipped as duplicates.
+        `columns` maps our field names to the CSV headers when they differ.
+        """
+        columns = {"date": "date", "description": "description", "amount": "amount",
+                   "category": "category", **(columns or {})}
+        stats = {"read": 0, "imported": 0, "duplicates": 0, "rejected": 0}
+        started = time.perf_counter()
+
+        with self.engine.connect() as conn:
+            transactions_import.create(conn, checkfirst=True)
+            for chunk in pd.read_csv(path, chunksize=chunksize, dtype=str, keep_default_na=False):
+                column = lambda field: chunk.get(columns[field], pd.Series("", index=chunk.index))
+                dates = pd.to_datetime(column("date"), errors="coerce", format=date_format, dayfirst=dayfirst)
+                amounts = _normalize_amounts(column("amount"))
+                valid = dates.notna() & amounts.notna()
+
+                batch = pd.DataFrame({
+                    "date": dates[valid].dt.strftime("%Y-%m-%d"),
+                    "description": column("description")[valid].str.strip(),
+                    "amount": amounts[valid],
+                    "category": column("category")[valid].str.strip(),
+                })
+                batch = batch.astype(object).where(batch.notna() & (batch != ""), None)
+                records = batch.to_dict("records")
+
+                with conn.begin():  # One transaction per chunk
+                    if records:
+                        conn.execute(transactions_import.insert(), records)
+                    inserted = conn.execute(MERGE_IMPORTED_TRANSACTIONS).rowcount
+                    if inserted:
+                        # One INSERT holds the write lock throughout, so its rows got
+                        # consecutive ids ending at last_insert_rowid(). Rows other
+                        # writers commit meanwhile fall outside that range.
+                        last_id = conn.execute("SELECT last_insert_rowid()").scalar()
+                        conn.execute(ADD_TO_TRANSACTION_SUMMARY,
+                                     {"first_id": last_id - inserted + 1, "last_id": last_id})
+                    conn.execute(transactions_import.delete())
+
+                stats["read"] += len(chunk)
+                stats["rejected"] += int((~valid).sum())
+                stats["imported"] += inserted
+                stats["duplicates"] += len(records) - inserted
+
+        elapsed = time.perf_counter() - started
+        stats["rows_per_sec"] = stats["read"] / elapsed if elapsed else 0.0
+        print(f"📥 Imported {stats['imported']:,} of {stats['read']:,} rows "
+              f"({stats['duplicates']:,} duplicates, {stats['rejected']:,} rejected) "
+              f"at {stats['rows_per_sec']:,.0f} rows/sec")
+        return stats
+    
+    def rebuild_summary(self):
+        """Recompute the summary from `transactions`, e.g. after manual edits caused drift."""
+        with self.engine.begin() as conn:
+            conn.execute("DELETE FROM transaction_summary")
+            conn.execute(REBUILD_TRANSACTION_SUMMARY)
+    
     def generate_report(self):
+        # Reads one small row per category/month instead of the whole history
         with self.engine.connect() as conn:
-            df = pd.read_sql("SELECT * FROM transactions", conn)
+            by_category = pd.read_sql(CATEGORY_REPORT, conn, index_col="category")
         
-        if df.empty:
+        if by_category.empty:
             print("No transactions found")
             return
         
         print("\n💵 Financial Report:")
-        print(f"Total Transactions: {len(df)}")
-        print(f"Net Balance: ${df['amount'].sum():.2f}")
+        print(f"Total Transactions: {by_category['n'].sum()}")
+        print(f"Net Balance: ${by_category['amount'].sum():.2f}")
         
         print("\n📊 By Category:")
-        print(df.groupby('category')['amount'].sum().sort_values())
+        print(by_category['amount'].sort_values())
 
 # Usage
 tracker = FinanceTracker()
@@ -211,34 +1131,278 @@ tracker.add_transaction("2023-06-01", "Grocery Shopping", -85.50, "Food")
 tracker.add_transaction("2023-06-02", "Paycheck", 2500.00, "Income")
 tracker.generate_report()
 
+def write_sample_bank_export(path, rows=100_000):
+    """Fake bank export with messy amounts, a few bad rows and repeated lines."""
+    categories = ["Food", "Rent", "Transport", "Income", "Fun"]
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(["date", "description", "amount", "category"])
+        for i in range(rows):
+            n = i % (rows // 2)  # Second half of the file repeats the first
+            day = f"2023-{n % 12 + 1:02d}-{n % 28 + 1:02d}"
+            amount = f"(${n % 500}.{n % 100:02d})" if n % 5 else f"$1,{n % 1000:03d}.00"
+            if n % 1000 == 999:
+                amount = "n/a"  # Unparseable -> rejected
+            writer.writerow([day, f"Payment #{n}", amount, categories[n % 5]])
+
+with tempfile.TemporaryDirectory() as tmp:
+    export_path = os.path.join(tmp, "bank_export.csv")
+    write_sample_bank_export(export_path, rows=2_000)
+    import_tracker = FinanceTracker(f"sqlite:///{os.path.join(tmp, 'import_demo.db')}")
+    import_tracker.import_csv(export_path)
+    import_tracker.import_csv(export_path)  # Second run: everything is a duplicate
+    import_tracker.generate_report()
+    import_tracker.engine.dispose()
+
+# 🔧 Project 1b: Async Finance Tracker
+import asyncio
+import contextlib
+import importlib.util
+import io
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+class AsyncFinanceTracker:
+    """FinanceTracker for asyncio services: every database call is awaited.
+
+    Runs on SQLAlchemy's async engine over aiosqlite with a connection pool,
+    and shares FinanceTracker's schema and summary upkeep. Call `setup()`
+    once before use and `close()` when done.
+    """
+
+    def __init__(self, db_url="sqlite+aiosqlite:///finance.db", pool_size=5):
+        self.engine = create_async_engine(
+            db_url,
+            poolclass=AsyncAdaptedQueuePool,
+            pool_size=pool_size,
+            max_overflow=0,
+            connect_args={"timeout": 30},  # Writers wait for SQLite's lock instead of failing
+        )
+
+    async def setup(self):
+        async with self.engine.begin() as conn:
+            await conn.execute(text("PRAGMA journal_mode = WAL"))  # Readers don't block the writer
+            has_summary = (await conn.execute(text(
+                "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'transaction_summary'"
+            ))).first() is not None
+            for ddl in (TRANSACTIONS_SCHEMA, TRANSACTION_SUMMARY_SCHEMA, TRANSACTIONS_NATURAL_KEY_INDEX):
+                await conn.execute(text(ddl))
+        if not has_summary:
+            await self.rebuild_summary()
+
+    async def add_transaction(self, date, description, amount, category):
+        await self.add_transactions([
+            {"date": date, "description": description, "amount": amount, "category": category}
+        ])
+        print("✅ Transaction added!")
+
+    async def add_transactions(self, rows):
+        """Insert many transaction dicts, and their summary updates, in one transaction."""
+        rows = list(rows)
+        if not rows:
+            return 0
+        async with self.engine.begin() as conn:
+            await conn.execute(text(INSERT_TRANSACTION), rows)
+            await conn.execute(text(UPSERT_TRANSACTION_SUMMARY), rows)
+        return len(rows)
+
+    async def rebuild_summary(self):
+        async with self.engine.begin() as conn:
+            await conn.execute(text("DELETE FROM transaction_summary"))
+            await conn.execute(text(REBUILD_TRANSACTION_SUMMARY))
+
+    async def generate_report(self):
+        async with self.engine.connect() as conn:
+            rows = (await conn.execute(text(CATEGORY_REPORT))).all()
+
+        if not rows:
+            print("No transactions found")
+            return
+
+        by_category = pd.Series({row.category: row.amount for row in rows}, name="amount")
+        by_category.index.name = "category"
+        print("\n💵 Financial Report:")
+        print(f"Total Transactions: {sum(row.n for row in rows)}")
+        print(f"Net Balance: ${by_category.sum():.2f}")
+
+        print("\n📊 By Category:")
+        print(by_category.sort_values())
+
+    async def close(self):
+        await self.engine.dispose()
+
+async def _worst_loop_stall(stop, interval=0.005):
+    """How late the event loop ever was in waking up a short sleep."""
+    loop = asyncio.get_running_loop()
+    worst = 0.0
+    while not stop.is_set():
+        started = loop.time()
+        await asyncio.sleep(interval)
+        worst = max(worst, loop.time() - started - interval)
+    return worst
+
+async def benchmark_async_finance(tasks=200, batch=5):
+    def rows(task):
+        return [{"date": "2023-07-01", "description": f"Task {task} #{i}", "amount": -1.0, "category": "Bench"}
+                for i in range(batch)]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        sync_tracker = FinanceTracker(f"sqlite:///{os.path.join(tmp, 'sync.db')}")
+        async_tracker = AsyncFinanceTracker(f"sqlite+aiosqlite:///{os.path.join(tmp, 'async.db')}")
+        await async_tracker.setup()
+
+        async def blocking_insert(task):
+            for row in rows(task):  # Sync engine calls stall the whole loop
+                sync_tracker.add_transaction(**row)
+
+        async def async_insert(task):
+            for row in rows(task):  # Same per-row API, but the loop keeps running
+                await async_tracker.add_transaction(**row)
+
+        print(f"\n{tasks} concurrent tasks inserting {batch} transactions each:")
+        for label, insert in (("sync engine", blocking_insert), ("async engine", async_insert)):
+            stop = asyncio.Event()
+            probe = asyncio.create_task(_worst_loop_stall(stop))
+            started = time.perf_counter()
+            with contextlib.redirect_stdout(io.StringIO()):
+                await asyncio.gather(*(insert(task) for task in range(tasks)))
+            elapsed = time.perf_counter() - started
+            stop.set()
+            stall = await probe
+            print(f"  {label:<13} {elapsed:6.2f}s total, worst event-loop stall {stall * 1000:8.1f} ms")
+
+        await async_tracker.generate_report()
+        await async_tracker.close()
+        sync_tracker.engine.dispose()
+
+async def async_finance_demo(db_path):
+    async_tracker = AsyncFinanceTracker(f"sqlite+aiosqlite:///{db_path}")
+    await async_tracker.setup()
+    await asyncio.gather(
+        async_tracker.add_transaction("2023-07-01", "Bookshop", -42.00, "Fun"),
+        async_tracker.add_transaction("2023-07-01", "Paycheck", 2500.00, "Income"),
+    )
+    await async_tracker.generate_report()
+    await async_tracker.close()
+
+if importlib.util.find_spec("aiosqlite"):
+    with tempfile.TemporaryDirectory() as tmp:
+        asyncio.run(async_finance_demo(os.path.join(tmp, "async_demo.db")))
+    if __name__ == "__main__":
+        asyncio.run(benchmark_async_finance())
+else:
+    print("\nNote: install aiosqlite to try the async tracker (pip install aiosqlite)")
+
 # 🔧 Project 2: Bookstore Inventory System
+class InventoryItem(Base):
+    __tablename__ = 'inventory'
+    # quantity first for the low-stock range scan; title makes it covering
+    __table_args__ = (Index('ix_inventory_low_stock', 'quantity', 'title'),)
+    
+    id = Column(Integer, primary_key=True)
+    sku = Column(String(32), unique=True)
+    title = Column(String(100), nullable=False)
+    author = Column(String(50))
+    price = Column(Float)
+    quantity = Column(Integer, nullable=False, default=0)
+
+inventory_table = InventoryItem.__table__
+
 class BookstoreInventory:
-    def __init__(self):
-        self.engine = create_engine('sqlite:///bookstore.db')
+    def __init__(self, db_url='sqlite:///bookstore.db'):
+        self.engine = create_engine(db_url)
         Base.metadata.create_all(self.engine)
         self.Session = sessionmaker(bind=self.engine)
     
-    def add_book(self, title, author, price, quantity):
+    def add_book(self, title, author, price, quantity, sku=None):
         session = self.Session()
-        book = Book(title=title, author=author, price=price, quantity=quantity)
+        book = InventoryItem(sku=sku, title=title, author=author, price=price, quantity=quantity)
         session.add(book)
         session.commit()
         session.close()
         print(f"📚 Added {title} to inventory")
     
-    def check_stock(self):
-        session = self.Session()
-        low_stock = session.query(Book).filter(Book.quantity < 5).all()
+    def low_stock(self, threshold=5):
+        """(title, quantity) rows below `threshold`, read straight from the index."""
+        query = (
+            select(inventory_table.c.title, inventory_table.c.quantity)
+            .where(inventory_table.c.quantity < threshold)
+            .order_by(inventory_table.c.quantity)
+        )
+        with self.engine.connect() as conn:  # No ORM session or identity map needed
+            return conn.execute(query).all()
+    
+    def check_stock(self, threshold=5):
+        low_stock = self.low_stock(threshold)
         
         if low_stock:
             print("\n⚠️ Low Stock Alert:")
-            for book in low_stock:
-                print(f"{book.title} - Only {book.quantity} left")
+            for title, quantity in low_stock:
+                print(f"{title} - Only {quantity} left")
         else:
             print("\nAll items sufficiently stocked")
-        
+    
+    def restock(self, items):
+        """Add units for many SKUs in one transaction; `items` maps sku -> units."""
+        items = items.items() if hasattr(items, "items") else items
+        stmt = (
+            update(inventory_table)
+            .where(inventory_table.c.sku == bindparam("restock_sku"))
+            .values(quantity=inventory_table.c.quantity + bindparam("units"))
+        )
+        params = [{"restock_sku": sku, "units": units} for sku, units in items]
+        if not params:
+            return 0
+        with self.engine.begin() as conn:
+            return conn.execute(stmt, params).rowcount
+
+def benchmark_inventory(skus=1_000_000, restocked=100_000, seed=0):
+    rng = np.random.default_rng(seed)
+    quantities = rng.integers(0, 500, skus)
+    with tempfile.TemporaryDirectory() as tmp:
+        store = BookstoreInventory(f"sqlite:///{os.path.join(tmp, 'inventory_bench.db')}")
+        with store.engine.begin() as conn:
+            for offset in range(0, skus, 50_000):
+                conn.execute(inventory_table.insert(), [
+                    {"sku": f"SKU-{i:07d}", "title": f"Book {i}", "author": f"Author {i % 5_000}",
+                     "price": 9.99, "quantity": int(quantities[i])}
+                    for i in range(offset, min(offset + 50_000, skus))
+                ])
+
+        session = store.Session()
+        started = time.perf_counter()
+        orm_rows = session.query(InventoryItem).filter(InventoryItem.quantity < 5).all()
+        orm_time = time.perf_counter() - started
         session.close()
 
+        started = time.perf_counter()
+        projected = store.low_stock(5)
+        projection_time = time.perf_counter() - started
+
+        started = time.perf_counter()
+        updated = store.restock({f"SKU-{i:07d}": 10 for i in rng.choice(skus, restocked, replace=False)})
+        restock_time = time.perf_counter() - started
+        store.engine.dispose()
+
+    print(f"\nInventory of {skus:,} SKUs ({len(projected):,} low on stock):")
+    print(f"  ORM objects query:     {orm_time * 1000:>8.1f} ms ({len(orm_rows):,} rows)")
+    print(f"  Index-only projection: {projection_time * 1000:>8.1f} ms")
+    print(f"  Restock {updated:,} SKUs in one transaction: {restock_time:.2f}s")
+
+with tempfile.TemporaryDirectory() as tmp:
+    inventory = BookstoreInventory(f"sqlite:///{os.path.join(tmp, 'inventory_demo.db')}")
+    inventory.add_book("The Hobbit", "J.R.R. Tolkien", 14.99, 2, sku="SKU-0000001")
+    inventory.add_book("Python Crash Course", "Eric Matthes", 39.99, 12, sku="SKU-0000002")
+    inventory.check_stock()
+    inventory.restock({"SKU-0000001": 10})
+    inventory.check_stock()
+    inventory.engine.dispose()
+
+if __name__ == "__main__":
+    benchmark_inventory(100_000, 10_000)
+    # benchmark_inventory()  # Full 1M-SKU run
+
 # ================ 🚀 5. NEXT STEPS ================
 print("\n" + "="*60 + "\n🚀 5. WHERE TO GO NEXT\n" + "="*60)
 print("""
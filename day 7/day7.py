@@ -58,11 +58,118 @@ def signup():
 print("\n" + "="*60 + "\n🔐 2. USER AUTHENTICATION\n" + "="*60)
 
 from werkzeug.security import generate_password_hash, check_password_hash
+from flask import g, jsonify, abort
+from collections import OrderedDict
+from functools import lru_cache, wraps
+from itsdangerous import URLSafeTimedSerializer, BadSignature, SignatureExpired
+import os
+import queue
+import secrets
 import sqlite3
+import threading
+import time
+
+app.config.update(
+    USERS_DB="users.db",
+    BLOG_DB="blog.db",
+    DB_POOLING=True,   # False opens and closes a connection per request
+    DB_POOL_SIZE=8,
+    # Set SECRET_KEY in the environment so every worker signs and checks
+    # tokens with the same key. Sessions themselves live in one process's
+    # SessionCache, so after a restart, or on another worker, a token gets a
+    # 401 and the user logs in again. Multi-worker deployments need a
+    # shared session store.
+    SECRET_KEY=os.environ.get("SECRET_KEY") or secrets.token_hex(32),
+    PASSWORD_HASH_METHOD="scrypt:32768:8:1",
+    SESSION_TTL=3600,          # seconds a login stays valid
+    SESSION_CACHE_SIZE=10_000,  # live sessions kept; the oldest are evicted
+)
+
+# 🛠️ Request-scoped connections from a per-worker pool
+class SQLitePool:
+    """Idle SQLite connections for one database file, reused across requests.
+
+    Connections are opened lazily in WAL mode, so readers never wait on the
+    single writer, and keep a statement cache so the same SQL is not
+    re-prepared on every request. The pool belongs to one process: after a
+    fork (gunicorn/uwsgi workers) the child starts with an empty pool
+    instead of sharing the parent's file handles.
+    """
+
+    def __init__(self, path, size=8, cached_statements=256):
+        self.path = path
+        self.size = size
+        self.cached_statements = cached_statements
+        self._pid = os.getpid()
+        self._idle = queue.LifoQueue(maxsize=size)
+
+    def _connect(self):
+        conn = sqlite3.connect(
+            self.path,
+            check_same_thread=False,  # handed between request threads
+            cached_statements=self.cached_statements,
+        )
+        conn.execute("PRAGMA journal_mode = WAL")
+        conn.execute("PRAGMA synchronous = NORMAL")
+        conn.execute("PRAGMA busy_timeout = 5000")
+        return conn
+
+    def acquire(self):
+        if os.getpid() != self._pid:
+            self._pid = os.getpid()
+            self._idle = queue.LifoQueue(maxsize=self.size)
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            return self._connect()
+
+    def release(self, conn):
+        if conn.in_transaction:
+            conn.rollback()  # never hand the next request a half-done write
+        try:
+            self._idle.put_nowait(conn)
+        except queue.Full:
+            conn.close()
+
+    def close(self):
+        while not self._idle.empty():
+            self._idle.get_nowait().close()
+
+_pools = {}
+
+def get_pool(path):
+    pool = _pools.get(path)
+    if pool is None:
+        pool = _pools[path] = SQLitePool(path, size=app.config["DB_POOL_SIZE"])
+    return pool
+
+def get_db(path):
+    """The connection to `path` for the current app context.
+
+    Opened (or borrowed from the pool) on first use and released by
+    `release_db` when the context tears down, so a request touches the
+    pool at most once per database however many queries it runs.
+    """
+    conns = g.setdefault("_db_conns", {})
+    if path not in conns:
+        if app.config["DB_POOLING"]:
+            pool = get_pool(path)
+            conns[path] = (pool.acquire(), pool)
+        else:
+            conns[path] = (sqlite3.connect(path), None)
+    return conns[path][0]
+
+@app.teardown_appcontext
+def release_db(exc):
+    for conn, pool in g.pop("_db_conns", {}).values():
+        if pool is None:
+            conn.close()
+        else:
+            pool.release(conn)
 
 # 🛠️ Example 3: Secure User Registration
 def create_auth_db():
-    conn = sqlite3.connect("users.db")
+    conn = sqlite3.connect(app.config["USERS_DB"])
     cursor = conn.cursor()
     cursor.execute("""
     CREATE TABLE IF NOT EXISTS users (
@@ -75,45 +182,183 @@ def create_auth_db():
     conn.close()
 
 def register_user(username, password):
-    password_hash = generate_password_hash(password)
+    password_hash = generate_password_hash(
+        password, method=app.config["PASSWORD_HASH_METHOD"]
+    )
+    conn = get_db(app.config["USERS_DB"])
     try:
-        conn = sqlite3.connect("users.db")
-        cursor = conn.cursor()
-        cursor.execute(
+        conn.execute(
             "INSERT INTO users (username, password_hash) VALUES (?, ?)",
             (username, password_hash)
         )
         conn.commit()
         return True
     except sqlite3.IntegrityError:
+        conn.rollback()
         return False  # Username exists
-    finally:
-        conn.close()
 
 # 🛠️ Example 4: Login Verification
-def verify_user(username, password):
-    conn = sqlite3.connect("users.db")
-    cursor = conn.cursor()
-    cursor.execute(
-        "SELECT password_hash FROM users WHERE username = ?", 
+@lru_cache(maxsize=None)
+def reference_hash(method):
+    """A throwaway hash of a random password, made with `method`.
+
+    Its prefix is werkzeug's expanded form of the method ("scrypt" becomes
+    "scrypt:32768:8:1"). Checking a password against it costs as much as
+    checking a real user's.
+    """
+    return generate_password_hash(secrets.token_hex(16), method=method)
+
+def needs_rehash(password_hash):
+    """True if the hash was made with other parameters than we use now.
+
+    Werkzeug hashes look like "method$salt$hash", where method carries the
+    parameters, e.g. "pbkdf2:sha256:260000" or "scrypt:32768:8:1".
+    """
+    current = reference_hash(app.config["PASSWORD_HASH_METHOD"])
+    return password_hash.split("$", 1)[0] != current.split("$", 1)[0]
+
+def authenticate(username, password):
+    """Return (user_id, username) if the password matches, else None.
+
+    A successful check is the one moment we hold the plain password, so a
+    hash stored with outdated parameters is upgraded right then. Unknown
+    usernames are checked against a dummy hash, so the response time does
+    not reveal which usernames exist.
+    """
+    conn = get_db(app.config["USERS_DB"])
+    result = conn.execute(
+        "SELECT id, password_hash FROM users WHERE username = ?", 
         (username,)
-    )
-    result = cursor.fetchone()
-    conn.close()
+    ).fetchone()
     
-    if result and check_password_hash(result[0], password):
-        return True
-    return False
+    if result is None:
+        check_password_hash(reference_hash(app.config["PASSWORD_HASH_METHOD"]), password)
+        return None
+    if not check_password_hash(result[1], password):
+        return None
+    if needs_rehash(result[1]):
+        conn.execute(
+            "UPDATE users SET password_hash = ? WHERE id = ?",
+            (generate_password_hash(password, method=app.config["PASSWORD_HASH_METHOD"]),
+             result[0]),
+        )
+        conn.commit()
+    return result[0], username
+
+def verify_user(username, password):
+    return authenticate(username, password) is not None
+
+# 🛠️ Example 4b: Verify once, then trust a signed session token
+class SessionCache:
+    """Live sessions by id, bounded, with least recently used evicted first.
+
+    Checking a password hash is slow on purpose (tens of milliseconds), far
+    too slow to repeat on every request. Login pays it once; later requests
+    show a signed token, which costs one HMAC and one dict lookup. Keeping
+    sessions server-side also means logout really ends them.
+    """
+
+    def __init__(self, maxsize=10_000, ttl=3600):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._sessions = OrderedDict()
+        self._lock = threading.Lock()
 
-# Test authentication system
+    def create(self, user_id, username):
+        session_id = secrets.token_urlsafe(16)
+        with self._lock:
+            self._sessions[session_id] = (user_id, username, time.monotonic() + self.ttl)
+            while len(self._sessions) > self.maxsize:
+                self._sessions.popitem(last=False)
+        return session_id
+
+    def get(self, session_id):
+        with self._lock:
+            entry = self._sessions.get(session_id)
+            if entry is None:
+                return None
+            if entry[2] < time.monotonic():
+                del self._sessions[session_id]
+                return None
+            self._sessions.move_to_end(session_id)
+            return entry[:2]
+
+    def revoke(self, session_id):
+        with self._lock:
+            return self._sessions.pop(session_id, None) is not None
+
+sessions = SessionCache(
+    maxsize=app.config["SESSION_CACHE_SIZE"], ttl=app.config["SESSION_TTL"]
+)
+token_signer = URLSafeTimedSerializer(app.config["SECRET_KEY"], salt="session-token")
+
+def session_from_request():
+    """The (session_id, user) a request's bearer token names, or None."""
+    header = request.headers.get("Authorization", "")
+    if not header.startswith("Bearer "):
+        return None
+    try:
+        session_id = token_signer.loads(header[7:], max_age=app.config["SESSION_TTL"])
+    except (BadSignature, SignatureExpired):  # forged, tampered with or too old
+        return None
+    user = sessions.get(session_id)
+    return (session_id, user) if user else None
+
+def login_required(view):
+    """Let a request through with a session token or, failing that, HTTP
+    Basic credentials; the latter pays for a password check every time."""
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        found = session_from_request()
+        if found is not None:
+            g.session_id, g.user = found
+        else:
+            auth = request.authorization
+            user = auth and auth.type == "basic" and authenticate(auth.username, auth.password)
+            if not user:
+                abort(401)
+            g.session_id, g.user = None, user
+        return view(*args, **kwargs)
+    return wrapper
+
+@app.route("/login", methods=["POST"])
+def login():
+    data = request.get_json(silent=True)
+    if data is None:
+        data = request.form
+    if not isinstance(data, dict):
+        abort(400, description="Expected an object with username and password")
+    username, password = data.get("username"), data.get("password")
+    if not isinstance(username, str) or not isinstance(password, str):
+        abort(400, description="username and password must be strings")
+    user = authenticate(username, password)
+    if user is None:
+        abort(401)
+    token = token_signer.dumps(sessions.create(*user))
+    return jsonify(token=token, expires_in=app.config["SESSION_TTL"])
+
+@app.route("/logout", methods=["POST"])
+@login_required
+def logout():
+    if g.session_id is not None:
+        sessions.revoke(g.session_id)
+    return "", 204
+
+@app.route("/api/me")
+@login_required
+def whoami():
+    return jsonify(id=g.user[0], username=g.user[1])
+
+# Test authentication system (outside a request, so push an app context)
 create_auth_db()
-register_user("admin", "securepassword123")
-print("Login successful?", verify_user("admin", "securepassword123"))
+with app.app_context():
+    register_user("admin", "securepassword123")
+    print("Login successful?", verify_user("admin", "securepassword123"))
 
 # ================ 3. REST API DESIGN ================
 print("\n" + "="*60 + "\n🔄 3. BUILDING REST APIS\n" + "="*60)
 
-from flask import jsonify, abort
+from collections import defaultdict
 
 # 🛠️ Example 5: Book API
 books = [
@@ -121,17 +366,176 @@ books = [
     {"id": 2, "title": "Fluent Python", "author": "Luciano Ramalho"}
 ]
 
+MAX_BATCH_IDS = 100
+
+class BookRepository:
+    """Books indexed by id and by author, for O(1) lookups per request.
+
+    The full list is the most expensive response to build, so its JSON body
+    is serialized once and reused until the next add, update or remove.
+    """
+
+    def __init__(self, books=()):
+        self._by_id = {}
+        self._by_author = defaultdict(dict)  # author -> {id: book}, in insert order
+        self._list_body = None
+        self._lock = threading.Lock()
+        for book in books:
+            self._index(dict(book))
+        self._next_id = max(self._by_id, default=0) + 1
+
+    def _index(self, book):
+        # Author first: a bad key fails before the book is visible by id
+        self._by_author[book["author"]][book["id"]] = book
+        self._by_id[book["id"]] = book
+
+    def _unindex(self, book):
+        by_author = self._by_author[book["author"]]
+        del by_author[book["id"]]
+        if not by_author:
+            del self._by_author[book["author"]]
+
+    def __len__(self):
+        return len(self._by_id)
+
+    def get(self, book_id):
+        return self._by_id.get(book_id)
+
+    def get_many(self, book_ids):
+        """The books for `book_ids` in the order asked, skipping unknown ids."""
+        return [self._by_id[i] for i in book_ids if i in self._by_id]
+
+    def by_author(self, author):
+        return list(self._by_author.get(author, {}).values())
+
+    def add(self, title, author):
+        if not isinstance(title, str) or not isinstance(author, str):
+            raise TypeError("title and author must be strings")
+        with self._lock:
+            book = {"id": self._next_id, "title": title, "author": author}
+            self._index(book)  # Index first: the id is only used once it is in
+            self._next_id += 1
+            self._list_body = None
+        return book
+
+    def update(self, book_id, **fields):
+        if any(not isinstance(fields[key], str) for key in ("title", "author") if key in fields):
+            raise TypeError("title and author must be strings")
+        with self._lock:
+            book = self._by_id.get(book_id)
+            if book is None:
+                return None
+            self._unindex(book)
+            book = {**book, **fields, "id": book_id}
+            self._index(book)
+            self._list_body = None
+        return book
+
+    def remove(self, book_id):
+        with self._lock:
+            book = self._by_id.pop(book_id, None)
+            if book is None:
+                return False
+            self._unindex(book)
+            self._list_body = None
+        return True
+
+    def list_json(self):
+        """Serialized JSON for every book, built at most once per change."""
+        body = self._list_body
+        if body is None:
+            with self._lock:
+                if self._list_body is None:
+                    self._list_body = app.json.dumps(list(self._by_id.values()))
+                body = self._list_body
+        return body
+
+book_repo = BookRepository(books)
+
+def parse_ids(raw):
+    try:
+        ids = [int(part) for part in raw.split(",") if part.strip()]
+    except ValueError:
+        abort(400, description="ids must be comma-separated integers")
+    if len(ids) > MAX_BATCH_IDS:
+        abort(400, description=f"At most {MAX_BATCH_IDS} ids per request")
+    return ids
+
 @app.route("/api/books", methods=["GET"])
 def get_books():
-    return jsonify(books)
+    if "ids" in request.args:
+        return jsonify(book_repo.get_many(parse_ids(request.args["ids"])))
+    if "author" in request.args:
+        return jsonify(book_repo.by_author(request.args["author"]))
+    return app.response_class(book_repo.list_json(), mimetype=app.json.mimetype)
+
+@app.route("/api/books", methods=["POST"])
+def create_book():
+    data = request.get_json(silent=True)
+    if not isinstance(data, dict):
+        abort(400, description="Expected an object with title and author")
+    title, author = data.get("title"), data.get("author")
+    if not isinstance(title, str) or not isinstance(author, str) or not title or not author:
+        abort(400, description="title and author must be non-empty strings")
+    return jsonify(book_repo.add(title, author)), 201
 
 @app.route("/api/books/<int:book_id>", methods=["GET"])
 def get_book(book_id):
-    book = next((b for b in books if b["id"] == book_id), None)
+    book = book_repo.get(book_id)
     if book is None:
         abort(404)
     return jsonify(book)
 
+# 🛠️ Benchmark: repository lookups vs the list scan
+def benchmark_book_repository(total_books=1_000_000, lookups=1_000):
+    """Compare id lookup, batched lookup and list serialization at scale."""
+    rows = [
+        {"id": i, "title": f"Book {i}", "author": f"Author {i % 10_000}"}
+        for i in range(1, total_books + 1)
+    ]
+    t0 = time.perf_counter()
+    repo = BookRepository(rows)
+    print(f"Indexed {total_books:,} books in {time.perf_counter() - t0:.2f}s")
+
+    probe = [total_books - i * 7 for i in range(lookups)]  # spread, mostly deep
+    t0 = time.perf_counter()
+    for book_id in probe[:20]:
+        next((b for b in rows if b["id"] == book_id), None)
+    scan_us = (time.perf_counter() - t0) / 20 * 1e6
+    t0 = time.perf_counter()
+    for book_id in probe:
+        repo.get(book_id)
+    index_us = (time.perf_counter() - t0) / lookups * 1e6
+    print(f"get by id:      scan {scan_us:10.1f} µs   index {index_us:6.2f} µs")
+
+    batch = probe[:MAX_BATCH_IDS]
+    t0 = time.perf_counter()
+    repo.get_many(batch)
+    print(f"batch of {len(batch)} ids:  {(time.perf_counter() - t0) * 1e6:.1f} µs "
+          f"(one request instead of {len(batch)})")
+
+    t0 = time.perf_counter()
+    body = repo.list_json()
+    cold_ms = (time.perf_counter() - t0) * 1000
+    t0 = time.perf_counter()
+    repo.list_json()
+    warm_ms = (time.perf_counter() - t0) * 1000
+    print(f"full list JSON: serialize {cold_ms:.1f} ms, cached {warm_ms:.4f} ms "
+          f"({len(body) / 2**20:.1f} MiB)")
+
+    repo.add("Fresh Book", "Author 1")
+    t0 = time.perf_counter()
+    repo.list_json()
+    print(f"after add: re-serialized in {(time.perf_counter() - t0) * 1000:.1f} ms")
+
+# Benchmarks only run from the command line, and only once: the debug
+# reloader re-runs this file in a child process just to serve requests
+RUN_BENCHMARKS = __name__ == "__main__" and "WERKZEUG_RUN_MAIN" not in os.environ
+
+if RUN_BENCHMARKS:
+    benchmark_book_repository(total_books=100_000)
+    # benchmark_book_repository()  # full 1M-book run
+
 # ================ 4. DEPLOYMENT OPTIONS ================
 print("\n" + "="*60 + "\n🚀 4. DEPLOYING YOUR APP\n" + "="*60)
 
@@ -167,10 +571,68 @@ print("\n" + "="*60 + "\n🚀 4. DEPLOYING YOUR APP\n" + "="*60)
 print("\n" + "="*60 + "\n🏆 5. FLASK BLOG ENGINE\n" + "="*60)
 
 from datetime import datetime
+from collections import namedtuple
+from flask import Response, stream_with_context
+from werkzeug.http import http_date, quote_etag
+from markupsafe import escape
+from urllib.parse import quote_plus
+import base64
+import hashlib
+import tempfile
+
+BLOG_PAGE_SIZE = 20
+
+app.config.update(
+    PAGE_CACHE=True,
+    PAGE_CACHE_SIZE=256,
+    PAGE_CACHE_SHARED=None,  # path of a SQLite file shared by all workers
+    PAGE_CACHE_TTL=5.0,      # without a shared file: max staleness after another worker's write
+    BLOG_STREAMING=False,    # stream /blog instead of caching whole pages
+)
+
+# Newest-first listing walks this index in order, so a page never sorts or
+# skips rows it does not show.
+POSTS_PAGE_INDEX = """
+CREATE INDEX IF NOT EXISTS idx_posts_created_id
+ON posts (created_at DESC, id DESC)
+"""
+
+# Full-text index over posts. It is an external-content table: it stores only
+# the index and reads title/content back from `posts`, and the triggers keep
+# it in step with every insert, update and delete.
+POSTS_SEARCH_SCHEMA = """
+CREATE VIRTUAL TABLE IF NOT EXISTS posts_fts USING fts5(
+    title, content, content='posts', content_rowid='id'
+);
+CREATE TRIGGER IF NOT EXISTS posts_fts_insert AFTER INSERT ON posts BEGIN
+    INSERT INTO posts_fts (rowid, title, content)
+    VALUES (new.id, new.title, new.content);
+END;
+CREATE TRIGGER IF NOT EXISTS posts_fts_delete AFTER DELETE ON posts BEGIN
+    INSERT INTO posts_fts (posts_fts, rowid, title, content)
+    VALUES ('delete', old.id, old.title, old.content);
+END;
+CREATE TRIGGER IF NOT EXISTS posts_fts_update AFTER UPDATE ON posts BEGIN
+    INSERT INTO posts_fts (posts_fts, rowid, title, content)
+    VALUES ('delete', old.id, old.title, old.content);
+    INSERT INTO posts_fts (rowid, title, content)
+    VALUES (new.id, new.title, new.content);
+END;
+"""
+
+def create_post_search(conn):
+    """Add the FTS index to a posts table, backfilling rows that predate it."""
+    exists = conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE name = 'posts_fts'"
+    ).fetchone()
+    conn.executescript(POSTS_SEARCH_SCHEMA)
+    if not exists:
+        conn.execute("INSERT INTO posts_fts (posts_fts) VALUES ('rebuild')")
+    conn.commit()
 
 # Configure database
 def init_blog_db():
-    conn = sqlite3.connect("blog.db")
+    conn = sqlite3.connect(app.config["BLOG_DB"])
     cursor = conn.cursor()
     cursor.execute("""
     CREATE TABLE IF NOT EXISTS posts (
@@ -181,29 +643,293 @@ def init_blog_db():
         created_at TEXT DEFAULT CURRENT_TIMESTAMP
     )
     """)
+    cursor.execute(POSTS_PAGE_INDEX)
     conn.commit()
+    create_post_search(conn)
     conn.close()
 
-# Blog routes
-@app.route("/blog")
-def blog_home():
-    conn = sqlite3.connect("blog.db")
-    cursor = conn.cursor()
-    cursor.execute("SELECT * FROM posts ORDER BY created_at DESC")
-    posts = cursor.fetchall()
-    conn.close()
-    
-    posts_html = "\n".join(
-        f"<article><h2>{p[1]}</h2><p>{p[2]}</p><small>By {p[3]}</small></article>"
-        for p in posts
+# 🛠️ Keyset pagination: a cursor is the (created_at, id) of the last row
+# shown, and the next page seeks straight to it through the index instead
+# of counting past OFFSET rows. Page 50,000 costs the same as page 1.
+def encode_cursor(created_at, post_id):
+    raw = f"{created_at}|{post_id}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+def decode_cursor(cursor):
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        created_at, post_id = raw.decode().rsplit("|", 1)
+        return created_at, int(post_id)
+    except ValueError:
+        abort(400, description="Invalid page cursor")
+
+def posts_page_query(before=None, after=None, page_size=BLOG_PAGE_SIZE):
+    """SQL and parameters for one page plus one look-ahead row.
+
+    Rows come newest first, except with `after`, where they come oldest
+    first and the caller reverses them.
+    """
+    columns = "SELECT id, title, content, author, created_at FROM posts"
+    if after is not None:
+        return (
+            f"{columns} WHERE (created_at, id) > (?, ?) "
+            "ORDER BY created_at, id LIMIT ?",
+            (*after, page_size + 1),
+        )
+    if before is not None:
+        return (
+            f"{columns} WHERE (created_at, id) < (?, ?) "
+            "ORDER BY created_at DESC, id DESC LIMIT ?",
+            (*before, page_size + 1),
+        )
+    return (
+        f"{columns} ORDER BY created_at DESC, id DESC LIMIT ?",
+        (page_size + 1,),
     )
-    
-    return f"""
+
+def fetch_posts_page(conn, before=None, after=None, page_size=BLOG_PAGE_SIZE):
+    """Return (posts, newer_cursor, older_cursor) for one page, newest first.
+
+    `before` continues towards older posts, `after` goes back towards newer
+    ones. One extra row is fetched to learn whether another page exists.
+    """
+    rows = conn.execute(*posts_page_query(before, after, page_size)).fetchall()
+    if after is not None:
+        has_newer, has_older = len(rows) > page_size, True
+        posts = rows[:page_size][::-1]
+    else:
+        has_newer, has_older = before is not None, len(rows) > page_size
+        posts = rows[:page_size]
+
+    if not posts:
+        return posts, None, None
+    newer = encode_cursor(posts[0][4], posts[0][0]) if has_newer else None
+    older = encode_cursor(posts[-1][4], posts[-1][0]) if has_older else None
+    return posts, newer, older
+
+# 🛠️ Rendered-page cache with write-through invalidation
+# Headers are built once per page, so a hit only copies them onto a response
+CachedPage = namedtuple("CachedPage", "body headers stored_at")
+
+PAGE_CACHE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS page_cache_meta (
+    id INTEGER PRIMARY KEY CHECK (id = 1),
+    generation INTEGER NOT NULL,
+    modified_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS page_cache (
+    key TEXT PRIMARY KEY,
+    generation INTEGER NOT NULL,
+    body TEXT NOT NULL,
+    etag TEXT NOT NULL
+);
+INSERT OR IGNORE INTO page_cache_meta (id, generation, modified_at)
+VALUES (1, 0, strftime('%s', 'now'));
+"""
+
+class PageCache:
+    """Rendered blog pages keyed by cursor, stamped with a generation.
+
+    Every write bumps the generation, which retires all cached pages at
+    once without tracking which pages a post lands on. Pages live in an
+    in-process LRU. With `shared_path`, the generation and the pages also
+    live in a local SQLite file, so one worker's write invalidates every
+    worker and a page rendered by one can be served by the others. Without
+    it, each process only sees its own writes, so pages also expire after
+    `ttl` seconds to bound how long other workers' posts stay hidden.
+    """
+
+    def __init__(self, maxsize=256, shared_path=None, ttl=5.0):
+        self.maxsize = maxsize
+        self.shared_path = shared_path
+        self.ttl = None if shared_path else ttl
+        self.hits = self.misses = 0
+        self._pages = OrderedDict()
+        self._lock = threading.Lock()
+        self._generation = (0, time.time())
+        self._schema_ready = False
+
+    def _shared(self):
+        conn = get_db(self.shared_path)
+        if not self._schema_ready:
+            conn.executescript(PAGE_CACHE_SCHEMA)
+            self._schema_ready = True
+        return conn
+
+    def generation(self):
+        """(counter, unix time of the last write) to render against."""
+        if self.shared_path is None:
+            return self._generation
+        return self._shared().execute(
+            "SELECT generation, modified_at FROM page_cache_meta WHERE id = 1"
+        ).fetchone()
+
+    def get(self, key, generation):
+        with self._lock:
+            entry = self._pages.get(key)
+            if entry is not None and entry[0] == generation[0] and (
+                self.ttl is None or time.monotonic() - entry[1].stored_at < self.ttl
+            ):
+                self._pages.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+        if self.shared_path is not None:
+            row = self._shared().execute(
+                "SELECT body, etag FROM page_cache WHERE key = ? AND generation = ?",
+                (key, generation[0]),
+            ).fetchone()
+            if row is not None:
+                page = self._store(key, generation, *row, modified_at=generation[1])
+                with self._lock:
+                    self.hits += 1
+                return page
+        with self._lock:
+            self.misses += 1
+        return None
+
+    def put(self, key, generation, body):
+        etag = hashlib.sha1(body.encode()).hexdigest()
+        if self.shared_path is not None:
+            conn = self._shared()
+            conn.execute(
+                "INSERT OR REPLACE INTO page_cache (key, generation, body, etag) "
+                "VALUES (?, ?, ?, ?)",
+                (key, generation[0], body, etag),
+            )
+            conn.commit()
+        # The shared generation knows when any worker last wrote; a process on
+        # its own only knows the page is no older than this render
+        modified_at = generation[1] if self.shared_path is not None else time.time()
+        return self._store(key, generation, body, etag, modified_at)
+
+    def _store(self, key, generation, body, etag, modified_at):
+        headers = [
+            ("ETag", quote_etag(etag)),
+            ("Last-Modified", http_date(modified_at)),
+            ("Cache-Control", "no-cache"),  # revalidate, and get a 304 back
+        ]
+        page = CachedPage(body, headers, time.monotonic())
+        with self._lock:
+            self._pages[key] = (generation[0], page)
+            self._pages.move_to_end(key)
+            while len(self._pages) > self.maxsize:
+                self._pages.popitem(last=False)
+        return page
+
+    def invalidate(self):
+        with self._lock:
+            self._generation = (self._generation[0] + 1, time.time())
+            self._pages.clear()
+        if self.shared_path is not None:
+            conn = self._shared()
+            conn.execute(
+                "UPDATE page_cache_meta "
+                "SET generation = generation + 1, modified_at = ? WHERE id = 1",
+                (time.time(),),
+            )
+            conn.execute("DELETE FROM page_cache")
+            conn.commit()
+
+    def stats(self):
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": self.hits / total if total else 0.0,
+                "pages": len(self._pages),
+            }
+
+page_cache = PageCache(
+    maxsize=app.config["PAGE_CACHE_SIZE"],
+    shared_path=app.config["PAGE_CACHE_SHARED"],
+    ttl=app.config["PAGE_CACHE_TTL"],
+)
+
+BLOG_PAGE_HEADER = """
         <h1>My Blog</h1>
-        {posts_html}
+        <form action="/blog/search"><input type="search" name="q" placeholder="Search posts"></form>
+"""
+
+def render_article(p):
+    return f"<article><h2>{p[1]}</h2><p>{p[2]}</p><small>By {p[3]}</small></article>"
+
+def render_blog_footer(newer, older):
+    nav_html = " ".join(
+        link for link in (
+            f'<a href="/blog?after={newer}">&larr; Newer</a>' if newer else "",
+            f'<a href="/blog?before={older}">Older &rarr;</a>' if older else "",
+        ) if link
+    )
+    return f"""
+        <nav>{nav_html}</nav>
         <a href="/blog/new">Create Post</a>
     """
 
+def render_blog_page(before=None, after=None, page_size=BLOG_PAGE_SIZE):
+    posts, newer, older = fetch_posts_page(
+        get_db(app.config["BLOG_DB"]),
+        before=decode_cursor(before) if before else None,
+        after=decode_cursor(after) if after else None,
+        page_size=page_size,
+    )
+    posts_html = "\n".join(render_article(p) for p in posts)
+    return BLOG_PAGE_HEADER + posts_html + render_blog_footer(newer, older)
+
+# 🛠️ Streaming render: the header goes out before the query runs, and
+# articles follow in batches as rows come off the cursor, so the first
+# byte no longer waits for the last row and the full page never sits in
+# memory at once. The nav links need the page's last row, so they come last.
+def stream_blog_page(before=None, after=None, page_size=BLOG_PAGE_SIZE, batch_size=50):
+    before = decode_cursor(before) if before else None  # a bad cursor
+    after = decode_cursor(after) if after else None     # 400s before streaming
+    def generate():
+        yield BLOG_PAGE_HEADER
+        conn = get_db(app.config["BLOG_DB"])
+        if after is not None:
+            # Rows arrive oldest first; the page is bounded, so reverse it whole
+            posts, newer, older = fetch_posts_page(conn, after=after, page_size=page_size)
+            yield "\n".join(render_article(p) for p in posts)
+            yield render_blog_footer(newer, older)
+            return
+
+        cursor = conn.execute(*posts_page_query(before=before, page_size=page_size))
+        first = last = None
+        shown, has_older = 0, False
+        for rows in iter(lambda: cursor.fetchmany(batch_size), []):
+            if shown + len(rows) > page_size:  # the look-ahead row
+                rows, has_older = rows[:page_size - shown], True
+            shown += len(rows)
+            if rows:
+                first = first or rows[0]
+                last = rows[-1]
+                yield "\n".join(render_article(p) for p in rows) + "\n"
+        newer = encode_cursor(first[4], first[0]) if first and before is not None else None
+        older = encode_cursor(last[4], last[0]) if last and has_older else None
+        yield render_blog_footer(newer, older)
+    return generate()
+
+# Blog routes
+@app.route("/blog")
+def blog_home():
+    before = request.args.get("before")
+    after = request.args.get("after")
+    if app.config["BLOG_STREAMING"]:
+        return Response(stream_with_context(stream_blog_page(before, after)))
+    if not app.config["PAGE_CACHE"]:
+        return render_blog_page(before, after)
+
+    key = f"{before or ''}|{after or ''}"
+    generation = page_cache.generation()  # read before rendering, so a
+    page = page_cache.get(key, generation)  # racing write retires this page
+    if page is None:
+        page = page_cache.put(key, generation, render_blog_page(before, after))
+
+    response = app.response_class(page.body, headers=page.headers)
+    if "If-None-Match" in request.headers or "If-Modified-Since" in request.headers:
+        return response.make_conditional(request)
+    return response
+
 @app.route("/blog/new", methods=["GET", "POST"])
 def new_post():
     if request.method == "POST":
@@ -211,14 +937,13 @@ def new_post():
         content = request.form["content"]
         author = request.form["author"]
         
-        conn = sqlite3.connect("blog.db")
-        cursor = conn.cursor()
-        cursor.execute(
+        conn = get_db(app.config["BLOG_DB"])
+        conn.execute(
             "INSERT INTO posts (title, content, author) VALUES (?, ?, ?)",
             (title, content, author)
         )
         conn.commit()
-        conn.close()
+        page_cache.invalidate()
         return "<h2>Post created!</h2><a href='/blog'>View all posts</a>"
     
     return """
@@ -230,9 +955,436 @@ def new_post():
         </form>
     """
 
+# 🛠️ Full-text search: MATCH walks the FTS index instead of scanning every
+# post the way LIKE '%term%' must, and bm25() ranks the matches.
+MAX_SEARCH_PAGE = 500
+
+# snippet() marks matches with control characters rather than <mark>, so the
+# excerpt can be HTML-escaped before the markers become tags
+SNIPPET_START, SNIPPET_END = "\x02", "\x03"
+
+SEARCH_POSTS = """
+SELECT p.id, p.title,
+       snippet(posts_fts, 1, char(2), char(3), '…', 16),
+       p.author, p.created_at
+FROM posts_fts
+JOIN posts AS p ON p.id = posts_fts.rowid
+WHERE posts_fts MATCH ?
+ORDER BY bm25(posts_fts, 5.0, 1.0)
+LIMIT ? OFFSET ?
+"""
+
+def fts_query(text):
+    """Turn user input into an FTS5 query that matches every term.
+
+    Each term is quoted, so operators and punctuation in the input
+    (AND, NEAR, *, ", -, :) are searched for literally rather than parsed.
+    Control characters, which FTS5's query parser rejects (a NUL ends the
+    string early), separate terms like whitespace.
+    """
+    text = "".join(ch if ch.isprintable() else " " for ch in text)
+    return " ".join('"' + term.replace('"', '""') + '"' for term in text.split())
+
+def highlight_snippet(snippet):
+    """Escape a snippet() excerpt, then turn its match markers into <mark>."""
+    return (
+        str(escape(snippet))
+        .replace(SNIPPET_START, "<mark>")
+        .replace(SNIPPET_END, "</mark>")
+    )
+
+def search_posts(conn, text, page=1, page_size=BLOG_PAGE_SIZE):
+    """Return (results, has_more) for one page of ranked matches.
+
+    Title hits weigh five times content hits. Results are ordered by
+    relevance, not time, so pages use OFFSET; a page_size + 1 row fetch
+    tells whether a next page exists.
+    """
+    query = fts_query(text)
+    if not query:
+        return [], False
+    rows = conn.execute(
+        SEARCH_POSTS, (query, page_size + 1, (page - 1) * page_size)
+    ).fetchall()
+    return rows[:page_size], len(rows) > page_size
+
+@app.route("/blog/search")
+def blog_search():
+    q = request.args.get("q", "").strip()
+    page = min(max(request.args.get("page", 1, type=int), 1), MAX_SEARCH_PAGE)
+    try:
+        results, has_more = search_posts(get_db(app.config["BLOG_DB"]), q, page)
+    except sqlite3.OperationalError:  # A query FTS5 still refuses to parse
+        abort(400, description="Invalid search query")
+
+    results_html = "\n".join(
+        f"<article><h2>{escape(r[1])}</h2><p>{highlight_snippet(r[2])}</p>"
+        f"<small>By {escape(r[3])}</small></article>"
+        for r in results
+    ) or "<p>No posts found.</p>"
+    link = f"/blog/search?q={quote_plus(q)}&page="
+    nav_html = " ".join(
+        a for a in (
+            f'<a href="{link}{page - 1}">&larr; Previous</a>' if page > 1 else "",
+            f'<a href="{link}{page + 1}">Next &rarr;</a>'
+            if has_more and page < MAX_SEARCH_PAGE else "",
+        ) if a
+    )
+    
+    return f"""
+        <h1>Search: {escape(q)}</h1>
+        <form><input type="search" name="q" value="{escape(q)}"></form>
+        {results_html}
+        <nav>{nav_html}</nav>
+        <a href="/blog">Back to blog</a>
+    """
+
 # Initialize and test
 init_blog_db()
 
+# 🛠️ Benchmark: keyset vs OFFSET at increasing depth
+def seed_posts(path, total_posts, batch_size=50_000, padding=0):
+    """Fill a blog database with synthetic posts, one per second of history.
+
+    `padding` appends that many filler sentences to each post's content.
+    """
+    filler = " Lorem ipsum dolor sit amet." * padding
+    conn = sqlite3.connect(path)
+    conn.execute("PRAGMA journal_mode = OFF")
+    conn.execute("PRAGMA synchronous = OFF")
+    conn.execute("""
+    CREATE TABLE IF NOT EXISTS posts (
+        id INTEGER PRIMARY KEY,
+        title TEXT NOT NULL,
+        content TEXT NOT NULL,
+        author TEXT NOT NULL,
+        created_at TEXT DEFAULT CURRENT_TIMESTAMP
+    )
+    """)
+    start = datetime(2020, 1, 1).timestamp()
+    for offset in range(0, total_posts, batch_size):
+        conn.executemany(
+            "INSERT INTO posts (title, content, author, created_at) VALUES (?, ?, ?, ?)",
+            (
+                (f"Post {i}", f"Body of post {i} about topic{i % 1000}.{filler}", f"author{i % 100}",
+                 datetime.fromtimestamp(start + i).strftime("%Y-%m-%d %H:%M:%S"))
+                for i in range(offset, min(offset + batch_size, total_posts))
+            ),
+        )
+        conn.commit()
+    conn.execute(POSTS_PAGE_INDEX)
+    conn.commit()
+    conn.close()
+
+def benchmark_blog_pagination(total_posts=1_000_000, repeats=20):
+    """Time one page at several depths with keyset seeks and with OFFSET."""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "blog.db")
+        seed_posts(path, total_posts)
+        conn = sqlite3.connect(path)
+        print(f"{'depth':>10} {'keyset ms':>10} {'offset ms':>10}")
+        for depth in (0, total_posts // 10, total_posts // 2, total_posts - BLOG_PAGE_SIZE):
+            # The cursor a reader would hold after paging down to `depth`
+            row = conn.execute(
+                "SELECT created_at, id FROM posts "
+                "ORDER BY created_at DESC, id DESC LIMIT 1 OFFSET ?",
+                (max(depth - 1, 0),),
+            ).fetchone()
+            cursor = row if depth else None
+
+            t0 = time.perf_counter()
+            for _ in range(repeats):
+                fetch_posts_page(conn, before=cursor)
+            keyset_ms = (time.perf_counter() - t0) / repeats * 1000
+
+            t0 = time.perf_counter()
+            for _ in range(repeats):
+                conn.execute(
+                    "SELECT id, title, content, author, created_at FROM posts "
+                    "ORDER BY created_at DESC, id DESC LIMIT ? OFFSET ?",
+                    (BLOG_PAGE_SIZE + 1, depth),
+                ).fetchall()
+            offset_ms = (time.perf_counter() - t0) / repeats * 1000
+            print(f"{depth:>10,} {keyset_ms:>10.3f} {offset_ms:>10.3f}")
+        conn.close()
+
+if RUN_BENCHMARKS:
+    benchmark_blog_pagination(total_posts=50_000)
+    # benchmark_blog_pagination()  # full 1M-post run, takes a few seconds to seed
+
+# 🛠️ Benchmark: FTS5 MATCH vs a LIKE scan
+def benchmark_post_search(total_posts=1_000_000, terms=None, repeats=5):
+    """Time the first results page per term through FTS5 and through LIKE.
+
+    The default terms are one that matches 0.1% of posts and one that matches
+    a single post, which LIKE can only find by reading the whole table.
+    """
+    terms = terms or ("topic777", str(total_posts // 2))
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "blog.db")
+        seed_posts(path, total_posts)
+        conn = sqlite3.connect(path)
+        t0 = time.perf_counter()
+        create_post_search(conn)
+        print(f"FTS backfill of {total_posts:,} posts: {time.perf_counter() - t0:.2f}s")
+
+        for term in terms:
+            t0 = time.perf_counter()
+            for _ in range(repeats):
+                results, _ = search_posts(conn, term)
+            fts_ms = (time.perf_counter() - t0) / repeats * 1000
+
+            t0 = time.perf_counter()
+            for _ in range(repeats):
+                like = conn.execute(
+                    "SELECT id, title, content, author, created_at FROM posts "
+                    "WHERE title LIKE ?1 OR content LIKE ?1 LIMIT ?2",
+                    (f"%{term}%", BLOG_PAGE_SIZE),
+                ).fetchall()
+            like_ms = (time.perf_counter() - t0) / repeats * 1000
+            print(f"{term!r}: FTS5 MATCH {fts_ms:8.2f} ms ({len(results)} ranked), "
+                  f"LIKE scan {like_ms:8.2f} ms ({len(like)} unranked)")
+        conn.close()
+
+# Every route is registered by now, so the app can start serving requests
+with app.test_client() as client:
+    print("GET /api/books?ids=1,2 ->", client.get("/api/books?ids=1,2").get_json())
+    for path in ("/blog", "/blog/search?q=flask"):
+        response = client.get(path)
+        print(f"GET {path} -> {response.status_code} ({len(response.data):,} bytes)")
+
+if RUN_BENCHMARKS:
+    benchmark_post_search(total_posts=50_000)
+    # benchmark_post_search()  # full 1M-post run
+
+# 🛠️ Load test: a wrk-style run against a real HTTP server
+from werkzeug.serving import make_server, WSGIRequestHandler
+import http.client
+
+class QuietRequestHandler(WSGIRequestHandler):
+    def log_request(self, *args, **kwargs):
+        pass  # one access-log line per request would swamp the numbers
+
+def load_test(paths, concurrency=8, duration=3.0, headers=None):
+    """Hit `paths` from `concurrency` keep-alive clients for `duration` seconds.
+
+    `paths` is one path or a list that each client cycles through; `headers`
+    go out with every request.
+
+    Serves `app` on an ephemeral port in a background thread and returns
+    the request count, requests/sec and p50/p99 latency in milliseconds.
+    """
+    server = make_server("127.0.0.1", 0, app, threaded=True,
+                         request_handler=QuietRequestHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    paths = [paths] if isinstance(paths, str) else list(paths)
+    latencies, errors, lock = [], [0], threading.Lock()
+    deadline = time.perf_counter() + duration
+
+    def client(offset):
+        conn = http.client.HTTPConnection("127.0.0.1", server.server_port)
+        mine, failed = [], 0
+        while time.perf_counter() < deadline:
+            path = paths[(offset + len(mine)) % len(paths)]
+            t0 = time.perf_counter()
+            conn.request("GET", path, headers=headers or {})
+            response = conn.getresponse()
+            response.read()
+            mine.append(time.perf_counter() - t0)
+            failed += response.status >= 400
+        conn.close()
+        with lock:
+            latencies.extend(mine)
+            errors[0] += failed
+
+    start = time.perf_counter()
+    clients = [threading.Thread(target=client, args=(i,)) for i in range(concurrency)]
+    for t in clients:
+        t.start()
+    for t in clients:
+        t.join()
+    elapsed = time.perf_counter() - start
+    server.shutdown()
+    server.server_close()
+
+    latencies.sort()
+    def pct(q):
+        return latencies[min(int(q * len(latencies)), len(latencies) - 1)] * 1000
+    return {
+        "requests": len(latencies),
+        "errors": errors[0],
+        "rps": len(latencies) / elapsed,
+        "p50_ms": pct(0.50),
+        "p99_ms": pct(0.99),
+    }
+
+def benchmark_db_pooling(total_posts=10_000, concurrency=8, duration=3.0):
+    """Load-test /blog with per-request connections, then with the pool."""
+    saved = {key: app.config[key] for key in ("BLOG_DB", "DB_POOLING", "PAGE_CACHE")}
+    with tempfile.TemporaryDirectory() as tmp:
+        app.config["BLOG_DB"] = os.path.join(tmp, "blog.db")
+        app.config["PAGE_CACHE"] = False  # measure the database path
+        seed_posts(app.config["BLOG_DB"], total_posts)
+        try:
+            for pooling in (False, True):  # pooled run switches the file to WAL
+                app.config["DB_POOLING"] = pooling
+                stats = load_test("/blog", concurrency, duration)
+                print(f"pooling={'on ' if pooling else 'off'} "
+                      f"{stats['rps']:8.0f} req/s  p50 {stats['p50_ms']:.2f} ms  "
+                      f"p99 {stats['p99_ms']:.2f} ms  ({stats['requests']} requests, "
+                      f"{stats['errors']} errors)")
+        finally:
+            pool = _pools.pop(app.config["BLOG_DB"], None)
+            if pool is not None:
+                pool.close()
+            app.config.update(saved)
+
+if RUN_BENCHMARKS:
+    benchmark_db_pooling(duration=1.0)
+    # benchmark_db_pooling(duration=10.0)  # longer run for steadier percentiles
+
+def benchmark_page_cache(total_posts=10_000, pages=10, concurrency=8, duration=3.0,
+                         requests_per_round=1_000):
+    """Load-test the first `pages` blog pages with the page cache off and on,
+    then time the same requests in-process through the test client."""
+    global page_cache
+    saved_config = {key: app.config[key] for key in ("BLOG_DB", "PAGE_CACHE")}
+    saved_cache = page_cache
+    with tempfile.TemporaryDirectory() as tmp:
+        app.config["BLOG_DB"] = os.path.join(tmp, "blog.db")
+        seed_posts(app.config["BLOG_DB"], total_posts)
+        page_cache = PageCache(maxsize=app.config["PAGE_CACHE_SIZE"])
+        try:
+            paths, cursor = ["/blog"], None
+            with app.app_context():
+                for _ in range(pages - 1):
+                    _, _, older = fetch_posts_page(
+                        get_db(app.config["BLOG_DB"]), before=cursor
+                    )
+                    paths.append(f"/blog?before={older}")
+                    cursor = decode_cursor(older)
+
+            client = app.test_client()
+            for enabled in (False, True):
+                app.config["PAGE_CACHE"] = enabled
+                stats = load_test(paths, concurrency, duration)
+                # The load test shares a GIL with its server; the test client
+                # isolates the cost of the view and Flask's request handling
+                rounds = []
+                for _ in range(5):
+                    t0 = time.perf_counter()
+                    for i in range(requests_per_round):
+                        client.get(paths[i % len(paths)])
+                    rounds.append((time.perf_counter() - t0) / requests_per_round * 1e6)
+                print(f"page cache={'on ' if enabled else 'off'} "
+                      f"{stats['rps']:8.0f} req/s  p50 {stats['p50_ms']:.2f} ms  "
+                      f"p99 {stats['p99_ms']:.2f} ms  "
+                      f"in-process {sorted(rounds)[2]:.0f} µs/request")
+            cache = page_cache.stats()
+            print(f"hit ratio {cache['hit_ratio']:.1%} "
+                  f"({cache['hits']} hits, {cache['misses']} misses)")
+
+            etag = client.get("/blog").headers["ETag"]
+            revalidated = client.get("/blog", headers={"If-None-Match": etag})
+            print("Revalidation with ETag:", revalidated.status_code)
+        finally:
+            page_cache = saved_cache
+            pool = _pools.pop(app.config["BLOG_DB"], None)
+            if pool is not None:
+                pool.close()
+            app.config.update(saved_config)
+
+if RUN_BENCHMARKS:
+    benchmark_page_cache(duration=1.0)
+    # benchmark_page_cache(duration=10.0)
+
+# 🛠️ Benchmark: buffered vs streamed page render
+import tracemalloc
+
+def benchmark_blog_streaming(total_posts=20_000, page_size=5_000, padding=40):
+    """Time to first byte and peak traced memory for one large /blog page."""
+    saved = app.config["BLOG_DB"]
+    with tempfile.TemporaryDirectory() as tmp:
+        app.config["BLOG_DB"] = os.path.join(tmp, "blog.db")
+        seed_posts(app.config["BLOG_DB"], total_posts, padding=padding)
+        modes = {
+            "buffered": lambda: iter([render_blog_page(page_size=page_size)]),
+            "streamed": lambda: stream_blog_page(page_size=page_size),
+        }
+        try:
+            with app.app_context():
+                for label, render in modes.items():
+                    for _ in render():  # warm SQLite's page cache
+                        pass
+                    tracemalloc.start()
+                    t0 = time.perf_counter()
+                    chunks = render()
+                    sent = len(next(chunks))
+                    ttfb_ms = (time.perf_counter() - t0) * 1000
+                    for chunk in chunks:  # a socket write would drop each chunk
+                        sent += len(chunk)
+                    total_ms = (time.perf_counter() - t0) * 1000
+                    peak = tracemalloc.get_traced_memory()[1]
+                    tracemalloc.stop()
+                    print(f"{label}: TTFB {ttfb_ms:7.2f} ms  total {total_ms:7.2f} ms  "
+                          f"peak {peak / 2**20:6.2f} MiB  ({sent / 2**20:.2f} MiB sent)")
+        finally:
+            pool = _pools.pop(app.config["BLOG_DB"], None)
+            if pool is not None:
+                pool.close()
+            app.config["BLOG_DB"] = saved
+
+if RUN_BENCHMARKS:
+    benchmark_blog_streaming(total_posts=5_000, page_size=2_000)
+    # benchmark_blog_streaming()
+
+# 🛠️ Benchmark: password check per request vs session token
+def benchmark_session_auth(concurrency=8, duration=3.0):
+    """Load-test /api/me with HTTP Basic auth, then with a session token."""
+    saved = app.config["USERS_DB"]
+    with tempfile.TemporaryDirectory() as tmp:
+        app.config["USERS_DB"] = os.path.join(tmp, "users.db")
+        create_auth_db()
+        try:
+            with app.app_context():
+                # A user whose hash predates the current parameters
+                get_db(app.config["USERS_DB"]).execute(
+                    "INSERT INTO users (username, password_hash) VALUES (?, ?)",
+                    ("reader", generate_password_hash("hunter22", method="pbkdf2:sha256:260000")),
+                )
+                get_db(app.config["USERS_DB"]).commit()
+
+            client = app.test_client()
+            login = client.post("/login", json={"username": "reader", "password": "hunter22"})
+            with app.app_context():
+                stored = get_db(app.config["USERS_DB"]).execute(
+                    "SELECT password_hash FROM users WHERE username = 'reader'"
+                ).fetchone()[0]
+            print("Rehashed on login:", stored.split("$", 1)[0])
+
+            basic = base64.b64encode(b"reader:hunter22").decode()
+            modes = {
+                "password per request": {"Authorization": f"Basic {basic}"},
+                "session token": {"Authorization": f"Bearer {login.get_json()['token']}"},
+            }
+            for label, headers in modes.items():
+                stats = load_test("/api/me", concurrency, duration, headers=headers)
+                print(f"{label:>20}: {stats['rps']:8.0f} req/s  p50 {stats['p50_ms']:.2f} ms  "
+                      f"p99 {stats['p99_ms']:.2f} ms  ({stats['errors']} errors)")
+
+            client.post("/logout", headers=modes["session token"])
+            print("Token after logout:",
+                  client.get("/api/me", headers=modes["session token"]).status_code)
+        finally:
+            pool = _pools.pop(app.config["USERS_DB"], None)
+            if pool is not None:
+                pool.close()
+            app.config["USERS_DB"] = saved
+
+if RUN_BENCHMARKS:
+    benchmark_session_auth(duration=1.0)
+    # benchmark_session_auth(duration=10.0)
+
 # ================ 📚 6. LEARNING RESOURCES ================
 print("\n" + "="*60 + "\n📚 6. CONTINUE LEARNING\n" + "="*60)
 print("""